@@ -0,0 +1,50 @@
+"""add_booking_requests_status_check_and_index
+
+Revision ID: c3d4e5f6a7b8
+Revises: 219d449bb81c
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, None] = "219d449bb81c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add status CHECK constraint and (studio_id, created_at) index to booking_requests."""
+    # booking_requests is created from the SQLAlchemy models (create_all), which
+    # already include these objects; only patch databases that predate them.
+    if not sa.inspect(op.get_bind()).has_table("booking_requests"):
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_booking_requests_studio_created "
+        "ON booking_requests (studio_id, created_at)"
+    )
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'ck_booking_requests_status'
+            ) THEN
+                ALTER TABLE booking_requests
+                ADD CONSTRAINT ck_booking_requests_status
+                CHECK (status IN ('new', 'in_progress', 'closed'));
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    """Drop status CHECK constraint and (studio_id, created_at) index from booking_requests."""
+    op.execute(
+        "ALTER TABLE booking_requests DROP CONSTRAINT IF EXISTS ck_booking_requests_status"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_booking_requests_studio_created")
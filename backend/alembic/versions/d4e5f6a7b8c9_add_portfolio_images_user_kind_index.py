@@ -0,0 +1,35 @@
+"""add_portfolio_images_user_kind_index
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite (user_id, kind) index to portfolio_images."""
+    # Databases built with create_all already have this index from the model's
+    # __table_args__; only create it where it is missing.
+    if not sa.inspect(op.get_bind()).has_table("portfolio_images"):
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_portfolio_images_user_kind "
+        "ON portfolio_images (user_id, kind)"
+    )
+
+
+def downgrade() -> None:
+    """Drop composite (user_id, kind) index from portfolio_images."""
+    op.execute("DROP INDEX IF EXISTS ix_portfolio_images_user_kind")
@@ -0,0 +1,50 @@
+"""backfill_profile_slugs
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROFILE_TABLES = ("artists", "models", "studios")
+
+
+def upgrade() -> None:
+    """Set missing artist/model/studio slugs to the owner's username.
+
+    Replaces the backfill that used to run on every application start.
+    Rows whose username is already taken as a slug by another profile are
+    left alone (public lookups still fall back to the username).
+    """
+    inspector = sa.inspect(op.get_bind())
+    for table in PROFILE_TABLES:
+        # Databases built with create_all may predate a table's slug column
+        if not inspector.has_table(table):
+            continue
+        if "slug" not in {column["name"] for column in inspector.get_columns(table)}:
+            continue
+        op.execute(f"""
+            UPDATE {table} AS profile
+            SET slug = users.username
+            FROM users
+            WHERE profile.user_id = users.id
+            AND profile.slug IS NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM {table} AS other WHERE other.slug = users.username
+            )
+        """)
+
+
+def downgrade() -> None:
+    """Data-only migration: backfilled slugs are kept."""
@@ -56,6 +56,24 @@ class Settings(BaseSettings):
     media_root: str = os.getenv("MEDIA_ROOT", str(ROOT_DIR / "media"))
     media_url_prefix: str = os.getenv("MEDIA_URL_PREFIX", "/media")
     max_upload_size_mb: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
+    # When set (e.g. "/_media"), media responses only carry an X-Accel-Redirect
+    # to this internal nginx location and nginx sends the file itself
+    media_accel_redirect_prefix: Optional[str] = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX") or None
+    # libwebp effort (0 = fastest .. 6 = smallest): low for small avatars/banners,
+    # the libwebp default for portfolio images where size matters more
+    webp_method: int = int(os.getenv("WEBP_METHOD", "2"))
+    webp_method_portfolio: int = int(os.getenv("WEBP_METHOD_PORTFOLIO", "4"))
+    # Worker processes for upload image processing (default: one per CPU)
+    media_process_workers: int = int(os.getenv("MEDIA_PROCESS_WORKERS", "0")) or (os.cpu_count() or 1)
+
+    # Public page cache: serve fresh for N seconds, then stale while one refresh runs
+    public_cache_fresh_seconds: float = float(os.getenv("PUBLIC_CACHE_FRESH_SECONDS", "5"))
+    public_cache_stale_seconds: float = float(os.getenv("PUBLIC_CACHE_STALE_SECONDS", "60"))
+
+    # N+1 query detection (opt-in, dev only: it patches SQLAlchemy globally);
+    # set NPLUSONE_RAISE=1 to fail requests instead of logging
+    nplusone_enabled: bool = os.getenv("NPLUSONE_ENABLED", "false").lower() in ("1", "true")
+    nplusone_raise: bool = os.getenv("NPLUSONE_RAISE", "0") == "1"
 
     def model_post_init(self, __context) -> None:
         """Parse CORS origins from environment variable after initialization."""
@@ -0,0 +1,13 @@
+"""Enumerations shared by the ORM models and the Pydantic schemas.
+
+Kept free of SQLAlchemy and Pydantic imports so either layer can use them
+without pulling in the other.
+"""
+import enum
+
+
+class BookingStatus(str, enum.Enum):
+    """Booking request status enumeration (stored as its string value)."""
+    NEW = "new"
+    IN_PROGRESS = "in_progress"
+    CLOSED = "closed"
@@ -1,17 +1,25 @@
 """FastAPI application entry point."""
+import logging
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from PIL import __version__ as pillow_version, features as pillow_features
 
 from app.routes import auth, users, media, artists, studios, models
 from app.config import settings
+from app.utils import media as media_utils
+from app.utils.nplusone import install_nplusone
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="InkQ API",
     description="InkQ backend API",
     version="1.0.0",
+    # Render response bodies with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration - configurable via BACKEND_CORS_ORIGINS env var
@@ -23,6 +31,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Report lazy-load N+1 patterns; opt-in so no deployment profiles by accident
+if settings.nplusone_enabled:
+    install_nplusone(app, raise_=settings.nplusone_raise)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.api_v1_prefix)
 app.include_router(users.router, prefix=settings.api_v1_prefix)
@@ -37,7 +49,33 @@ app.include_router(models.public_router, prefix=settings.api_v1_prefix)
 # Serve media files
 media_root = Path(settings.media_root)
 media_root.mkdir(parents=True, exist_ok=True)
-app.mount(settings.media_url_prefix, StaticFiles(directory=str(media_root)), name="media")
+app.mount(
+    settings.media_url_prefix,
+    media_utils.MediaStaticFiles(
+        directory=str(media_root),
+        accel_redirect_prefix=settings.media_accel_redirect_prefix,
+    ),
+    name="media",
+)
+
+
+@app.on_event("startup")
+def log_image_codecs():
+    """Log the JPEG decoder backing uploads; plain libjpeg is several times slower."""
+    if pillow_features.check_feature("libjpeg_turbo"):
+        logger.info(
+            "Pillow %s decoding JPEG with libjpeg-turbo %s",
+            pillow_version,
+            pillow_features.version_feature("libjpeg_turbo"),
+        )
+    else:
+        logger.warning("Pillow %s is not linked against libjpeg-turbo", pillow_version)
+
+
+@app.on_event("shutdown")
+def shutdown_media_workers():
+    """Stop the image processing worker processes."""
+    media_utils.shutdown_process_pool()
 
 
 @app.get("/")
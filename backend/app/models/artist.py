@@ -1,7 +1,7 @@
 """Artist model."""
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -37,7 +37,8 @@ class Artist(Base):
     # Onboarding/profile metadata
     about = Column(Text, nullable=True)
     # Store style IDs as JSON array of strings
-    styles = Column(JSONB, nullable=False, default=list)
+    # Plain JSON on SQLite (the optional in-memory test database)
+    styles = Column(JSONB().with_variant(JSON(), "sqlite"), nullable=False, default=list)
     city = Column(String, nullable=True)
     # Optional link to a studio (simple integer FK/id for now)
     studio_id = Column(Integer, nullable=True)
@@ -2,16 +2,34 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
+from app.enums import BookingStatus
 
 
 class BookingRequest(Base):
     """Booking request for a studio, optionally for a specific artist."""
 
     __tablename__ = "booking_requests"
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('new', 'in_progress', 'closed')",
+            name="ck_booking_requests_status",
+        ),
+        # Serves the studio dashboard list: WHERE studio_id = ? ORDER BY created_at DESC
+        Index("ix_booking_requests_studio_created", "studio_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     studio_id = Column(Integer, ForeignKey("studios.id"), nullable=False, index=True)
@@ -24,8 +42,8 @@ class BookingRequest(Base):
     client_contact = Column(String, nullable=False)
     comment = Column(Text, nullable=True)
 
-    # "new" | "in_progress" | "closed"
-    status = Column(String, nullable=False, default="new")
+    # BookingStatus value: "new" | "in_progress" | "closed"
+    status = Column(String, nullable=False, default=BookingStatus.NEW.value)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
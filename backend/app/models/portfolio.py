@@ -1,6 +1,6 @@
 """Portfolio image model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,6 +9,10 @@ class PortfolioImage(Base):
     """Portfolio image model for storing user portfolio/wannado images."""
     
     __tablename__ = "portfolio_images"
+    __table_args__ = (
+        # Public pages filter a user's images by kind (portfolio vs wannado)
+        Index("ix_portfolio_images_user_kind", "user_id", "kind"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
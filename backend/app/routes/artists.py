@@ -1,11 +1,14 @@
 """Artist profile and public artist routes."""
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from sqlalchemy import func, or_
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
-from app.db.base import get_db
+from app.config import settings
+from app.db.base import SessionLocal, get_db
 from app.models.user import User, AccountType
 from app.models.artist_studio_resident import ArtistStudioResident
 from app.models.artist import Artist
@@ -13,6 +16,7 @@ from app.models.portfolio import PortfolioImage
 from app.models.session import Session as SessionModel
 from app.routes.auth import get_current_session
 from app.schemas.artist import (
+    ARTIST_CARD_LIST_ADAPTER,
     ArtistMeResponse,
     ArtistOnboardingStepStatus,
     ArtistUpdateRequest,
@@ -24,8 +28,10 @@ from app.schemas.artist import (
     PublicArtistListResponse,
     PublicArtistStyle,
 )
-from app.schemas.media import PortfolioImageResponse, PortfolioListResponse
+from app.schemas.media import PortfolioListResponse
 from app.schemas.studio import ArtistInvitationsResponse, ArtistInvitationItem, ArtistInvitationStudio
+from app.utils.cache import StaleWhileRevalidateCache
+from app.utils.responses import items_json_response, paginated_json_response
 
 router = APIRouter(prefix="/artists", tags=["artists"])
 public_router = APIRouter(prefix="/public/artists", tags=["public_artists"])
@@ -41,6 +47,9 @@ AVAILABLE_STYLES: List[PublicArtistStyle] = [
     PublicArtistStyle(id="minimalist", label_en="Minimalist", label_ru="Минимализм"),
 ]
 
+# Styles are static, so their JSON is rendered once at import
+AVAILABLE_STYLES_JSON: bytes = TypeAdapter(List[PublicArtistStyle]).dump_json(AVAILABLE_STYLES)
+
 
 def get_current_user(
     session: SessionModel = Depends(get_current_session),
@@ -64,12 +73,6 @@ def get_or_create_artist(user: User, db: Session) -> Artist:
         db.add(artist)
         db.commit()
         db.refresh(artist)
-    # Ensure slug exists for public pages
-    if not artist.slug:
-        artist.slug = user.username
-        db.add(artist)
-        db.commit()
-        db.refresh(artist)
     # Ensure styles is always a list
     if artist.styles is None:
         artist.styles = []
@@ -134,7 +137,26 @@ def build_artist_me_response(user: User, artist: Artist, db: Session) -> ArtistM
         session_price=artist.session_price,
         instagram=artist.instagram,
         telegram=artist.telegram,
-        steps=steps,
+        step_about_complete=steps["about_complete"],
+        step_media_complete=steps["media_complete"],
+        step_portfolio_complete=steps["portfolio_complete"],
+        step_wannado_complete=steps["wannado_complete"],
+        first_incomplete_step=steps["first_incomplete_step"],
+    )
+
+
+def portfolio_item_from_image(img: PortfolioImage) -> PortfolioItem:
+    """Build the public portfolio item for a stored image."""
+    return PortfolioItem(
+        id=img.id,
+        url=img.url,
+        width=img.width,
+        height=img.height,
+        kind=img.kind,  # type: ignore[typeddict-item]
+        title=img.title,
+        description=img.description,
+        approx_price=img.approx_price,
+        placement=img.placement,
     )
 
 
@@ -227,6 +249,9 @@ def update_me(
     db.refresh(user)
     db.refresh(artist)
 
+    # City or onboarding state may have changed the public city list
+    public_artist_filters_cache.clear()
+
     return build_artist_me_response(user, artist, db)
 
 
@@ -408,32 +433,12 @@ def get_public_artist(
     )
 
     portfolio_items: List[PortfolioItem] = [
-        PortfolioItem(
-            id=img.id,
-            url=img.url,
-            width=img.width,
-            height=img.height,
-            kind=img.kind,  # type: ignore[arg-type]
-            title=img.title,
-            description=img.description,
-            approx_price=img.approx_price,
-            placement=img.placement,
-        )
+        portfolio_item_from_image(img)
         for img in images
         if img.kind == "portfolio"
     ]
     wannado_items: List[PortfolioItem] = [
-        PortfolioItem(
-            id=img.id,
-            url=img.url,
-            width=img.width,
-            height=img.height,
-            kind=img.kind,  # type: ignore[arg-type]
-            title=img.title,
-            description=img.description,
-            approx_price=img.approx_price,
-            placement=img.placement,
-        )
+        portfolio_item_from_image(img)
         for img in images
         if img.kind == "wannado"
     ]
@@ -466,7 +471,7 @@ def list_public_artists(
     ),
     limit: int = Query(default=16, ge=1, le=48),
     offset: int = Query(default=0, ge=0),
-) -> PublicArtistListResponse:
+) -> Response:
     """List public artists with optional city and style filters.
     
     Only returns artists who have completed onboarding (onboarding_completed=True).
@@ -505,16 +510,11 @@ def list_public_artists(
 
         items: List[PublicArtistCard] = []
         for user, artist in rows:
-            # Ensure slug exists, fallback to username
-            slug = artist.slug or user.username
-            if not artist.slug:
-                artist.slug = user.username
-                db.add(artist)
             items.append(
                 PublicArtistCard(
                     id=user.id,
                     username=user.username,
-                    slug=slug,
+                    slug=artist.slug or user.username,
                     display_name=artist.display_name,
                     city=artist.city,
                     styles=list(artist.styles or []),
@@ -524,14 +524,8 @@ def list_public_artists(
                     banner_url=user.banner_url,
                 )
             )
-        db.commit()
 
-        return PublicArtistListResponse(
-            items=items,
-            total=total,
-            limit=limit,
-            offset=offset,
-        )
+        return paginated_json_response(ARTIST_CARD_LIST_ADAPTER, items, total, limit, offset)
     except Exception as e:
         # Log the error for debugging but return a clean error response
         import logging
@@ -543,32 +537,27 @@ def list_public_artists(
         )
 
 
+# Holds the rendered filters body under a single key
+public_artist_filters_cache: StaleWhileRevalidateCache[bytes] = StaleWhileRevalidateCache(
+    fresh_seconds=settings.public_cache_fresh_seconds,
+    stale_seconds=settings.public_cache_stale_seconds,
+    session_factory=SessionLocal,
+    maxsize=1,
+)
+
+
 @public_router.get("/filters", response_model=PublicArtistFiltersResponse)
 def get_public_artist_filters(
     db: Session = Depends(get_db),
-) -> PublicArtistFiltersResponse:
+) -> Response:
     """Get available filters (cities and styles) for public artists catalog.
     
-    Only includes cities from artists who have completed onboarding.
+    Only includes cities from artists who have completed onboarding. The JSON
+    body is cached and served stale while being refreshed.
     """
     try:
-        city_rows = (
-            db.query(Artist.city)
-            .join(User, Artist.user_id == User.id)
-            .filter(
-                User.account_type == AccountType.ARTIST,
-                User.onboarding_completed == True,
-                Artist.city.isnot(None),
-                func.length(func.trim(Artist.city)) > 0,
-            )
-            .distinct()
-            .order_by(Artist.city)
-            .all()
-        )
-
-        cities = [row[0] for row in city_rows if row[0] is not None]
-
-        return PublicArtistFiltersResponse(cities=cities, styles=AVAILABLE_STYLES)
+        body = public_artist_filters_cache.get("filters", db, _build_public_artist_filters_json)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
@@ -579,6 +568,27 @@ def get_public_artist_filters(
         )
 
 
+def _build_public_artist_filters_json(key: str, db: Session) -> bytes:
+    """Render the `PublicArtistFiltersResponse` body for the current cities."""
+    city_rows = (
+        db.query(Artist.city)
+        .join(User, Artist.user_id == User.id)
+        .filter(
+            User.account_type == AccountType.ARTIST,
+            User.onboarding_completed == True,
+            Artist.city.isnot(None),
+            func.length(func.trim(Artist.city)) > 0,
+        )
+        .distinct()
+        .order_by(Artist.city)
+        .all()
+    )
+
+    cities = [row[0] for row in city_rows if row[0] is not None]
+
+    return b'{"cities":' + orjson.dumps(cities) + b',"styles":' + AVAILABLE_STYLES_JSON + b"}"
+
+
 @public_router.get("/{slug}", response_model=PublicArtistResponse)
 def get_public_artist_by_slug(
     slug: str = Path(..., description="Artist slug"),
@@ -613,13 +623,6 @@ def get_public_artist_by_slug(
             detail="Artist not found",
         )
     
-    # Ensure slug is set
-    if not artist.slug:
-        artist.slug = user.username
-        db.add(artist)
-        db.commit()
-        db.refresh(artist)
-    
     images: List[PortfolioImage] = (
         db.query(PortfolioImage)
         .filter(PortfolioImage.user_id == user.id)
@@ -627,32 +630,12 @@ def get_public_artist_by_slug(
     )
 
     portfolio_items: List[PortfolioItem] = [
-        PortfolioItem(
-            id=img.id,
-            url=img.url,
-            width=img.width,
-            height=img.height,
-            kind=img.kind,  # type: ignore[arg-type]
-            title=img.title,
-            description=img.description,
-            approx_price=img.approx_price,
-            placement=img.placement,
-        )
+        portfolio_item_from_image(img)
         for img in images
         if img.kind == "portfolio"
     ]
     wannado_items: List[PortfolioItem] = [
-        PortfolioItem(
-            id=img.id,
-            url=img.url,
-            width=img.width,
-            height=img.height,
-            kind=img.kind,  # type: ignore[arg-type]
-            title=img.title,
-            description=img.description,
-            approx_price=img.approx_price,
-            placement=img.placement,
-        )
+        portfolio_item_from_image(img)
         for img in images
         if img.kind == "wannado"
     ]
@@ -698,31 +681,7 @@ def get_public_artist_portfolio(
             detail="Artist not found",
         )
     
-    images = (
-        db.query(PortfolioImage)
-        .filter(
-            PortfolioImage.user_id == artist.user_id,
-            PortfolioImage.kind == "portfolio",
-        )
-        .order_by(PortfolioImage.created_at.desc())
-        .all()
-    )
-    
-    items = [
-        PortfolioImageResponse(
-            id=img.id,
-            user_id=img.user_id,
-            kind=img.kind,
-            url=img.url,
-            width=img.width,
-            height=img.height,
-            mime_type=img.mime_type,
-            created_at=img.created_at.isoformat(),
-        )
-        for img in images
-    ]
-    
-    return PortfolioListResponse(items=items)
+    return _public_images_response(artist.user_id, "portfolio", db)
 
 
 @public_router.get("/{slug}/wannado", response_model=PortfolioListResponse)
@@ -748,29 +707,32 @@ def get_public_artist_wannado(
             detail="Artist not found",
         )
     
-    images = (
-        db.query(PortfolioImage)
-        .filter(
-            PortfolioImage.user_id == artist.user_id,
-            PortfolioImage.kind == "wannado",
-        )
-        .order_by(PortfolioImage.created_at.desc())
-        .all()
-    )
-    
-    items = [
-        PortfolioImageResponse(
-            id=img.id,
-            user_id=img.user_id,
-            kind=img.kind,
-            url=img.url,
-            width=img.width,
-            height=img.height,
-            mime_type=img.mime_type,
-            created_at=img.created_at.isoformat(),
-        )
-        for img in images
-    ]
-    
-    return PortfolioListResponse(items=items)
+    return _public_images_response(artist.user_id, "wannado", db)
+
+
+# Columns of PortfolioImageResponse exposed on the public lists; the optional
+# metadata fields are not part of these payloads and are left out.
+_PUBLIC_IMAGE_COLUMNS = (
+    PortfolioImage.id,
+    PortfolioImage.user_id,
+    PortfolioImage.kind,
+    PortfolioImage.url,
+    PortfolioImage.width,
+    PortfolioImage.height,
+    PortfolioImage.mime_type,
+    PortfolioImage.created_at,
+)
 
+
+def _public_images_response(user_id: int, kind: str, db: Session) -> Response:
+    """Render a `PortfolioListResponse` of one kind of an artist's images, newest first.
+
+    Rows are fetched here, inside the handler, and encoded in one pass
+    without building response models.
+    """
+    rows = db.execute(
+        select(*_PUBLIC_IMAGE_COLUMNS)
+        .where(PortfolioImage.user_id == user_id, PortfolioImage.kind == kind)
+        .order_by(PortfolioImage.created_at.desc())
+    ).all()
+    return items_json_response(rows, lambda row: row._asdict())
@@ -79,10 +79,10 @@ def create_role_for_user(db: Session, user: User, account_type: str):
         artist = Artist(user_id=user.id, slug=user.username)
         db.add(artist)
     elif account_type == "studio":
-        studio = Studio(user_id=user.id)
+        studio = Studio(user_id=user.id, slug=user.username)
         db.add(studio)
     elif account_type == "model":
-        model = Model(user_id=user.id)
+        model = Model(user_id=user.id, slug=user.username)
         db.add(model)
     else:
         raise ValueError(f"Invalid account_type: {account_type}")
@@ -281,13 +281,15 @@ def signin(
     Accepts login (email or username) and password.
     Returns access_token and user data.
     """
-    # Find user by email or username (case-insensitive for email)
-    user = db.query(User).filter(
-        or_(
-            User.email.ilike(signin_data.login),
-            User.username == signin_data.login
-        )
-    ).first()
+    # Find user by email or username (case-insensitive for email). A login
+    # without "@" cannot be an email, so skip the unindexable ILIKE branch.
+    # Usernames are not restricted, so "@" logins still check both columns.
+    login = signin_data.login
+    if "@" in login:
+        login_filter = or_(User.email.ilike(login), User.username == login)
+    else:
+        login_filter = User.username == login
+    user = db.query(User).filter(login_filter).first()
     
     if not user:
         raise HTTPException(
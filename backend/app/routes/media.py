@@ -1,9 +1,7 @@
 """Media upload routes for avatars, banners, and portfolio."""
-import io
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form, Path
 from sqlalchemy.orm import Session
-from PIL import Image
 from app.db.base import get_db
 from app.models.user import User, AccountType
 from app.models.session import Session as SessionModel
@@ -16,13 +14,11 @@ from app.utils.media import (
     get_avatars_dir,
     get_banners_dir,
     get_portfolio_dir,
-    generate_safe_filename,
-    process_avatar,
-    process_banner,
-    process_portfolio,
-    save_image,
+    write_media_file,
+    process_upload_async,
+    process_portfolio_batch,
+    read_upload_limited,
     get_media_url,
-    MAX_UPLOAD_SIZE,
 )
 from app.schemas.media import (
     MediaUploadResponse,
@@ -113,30 +109,20 @@ async def _upload_avatar(file: UploadFile, user: User, db: Session) -> MediaUplo
     # Validate file type
     validate_file(file)
     
-    # Read file content
-    content = await file.read()
+    # Read file content (size limit and real image format enforced while reading)
+    content = await read_upload_limited(file)
     
-    # Check file size
-    if len(content) > MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Maximum size: {MAX_UPLOAD_SIZE / (1024 * 1024)} MB"
-        )
-    
-    # Load and process image
+    # Load and process image (off the event loop)
     try:
-        image = Image.open(io.BytesIO(content))
-        processed_image, width, height = process_avatar(image)
+        encoded, width, height = await process_upload_async("avatar", content)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid image file: {str(e)}"
         )
     
-    # Generate filename and save
-    filename = generate_safe_filename(user.id, "avatar", "webp")
-    file_path = get_avatars_dir() / filename
-    save_image(processed_image, file_path, format="WEBP")
+    # Save under a content-addressed filename
+    file_path = write_media_file(get_avatars_dir(), encoded, user.id, "avatar")
     
     # Update user record
     media_url = get_media_url(file_path)
@@ -199,30 +185,20 @@ async def _upload_banner(file: UploadFile, user: User, db: Session) -> MediaUplo
     # Validate file type
     validate_file(file)
     
-    # Read file content
-    content = await file.read()
+    # Read file content (size limit and real image format enforced while reading)
+    content = await read_upload_limited(file)
     
-    # Check file size
-    if len(content) > MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Maximum size: {MAX_UPLOAD_SIZE / (1024 * 1024)} MB"
-        )
-    
-    # Load and process image
+    # Load and process image (off the event loop)
     try:
-        image = Image.open(io.BytesIO(content))
-        processed_image, width, height = process_banner(image)
+        encoded, width, height = await process_upload_async("banner", content)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid image file: {str(e)}"
         )
     
-    # Generate filename and save
-    filename = generate_safe_filename(user.id, "banner", "webp")
-    file_path = get_banners_dir() / filename
-    save_image(processed_image, file_path, format="WEBP")
+    # Save under a content-addressed filename
+    file_path = write_media_file(get_banners_dir(), encoded, user.id, "banner")
     
     # Update user record
     media_url = get_media_url(file_path)
@@ -305,29 +281,30 @@ async def _upload_portfolio(
     created_items = []
     portfolio_dir = get_portfolio_dir(user.id)
     
+    contents: List[bytes] = []
+    mime_types: List[str] = []
     for file in files:
         # Validate file type
         validate_file(file)
         
         # Read file content
-        content = await file.read()
-        
-        # Check file size
-        if len(content) > MAX_UPLOAD_SIZE:
-            continue  # Skip oversized files, but continue with others
-        
-        # Load and process image
         try:
-            image = Image.open(io.BytesIO(content))
-            processed_image, width, height = process_portfolio(image)
-            mime_type = file.content_type or "image/webp"
-        except Exception:
+            content = await read_upload_limited(file)
+        except HTTPException:
+            continue  # Skip oversized or non-image files, but continue with others
+        contents.append(content)
+        mime_types.append(file.content_type or "image/webp")
+    
+    # Process the whole batch in parallel (off the event loop)
+    results = await process_portfolio_batch(contents)
+    
+    for result, mime_type in zip(results, mime_types):
+        if isinstance(result, BaseException):
             continue  # Skip invalid images
+        encoded, width, height = result
         
-        # Generate filename and save
-        filename = generate_safe_filename(user.id, "portfolio", "webp")
-        file_path = portfolio_dir / filename
-        save_image(processed_image, file_path, format="WEBP")
+        # Save under a content-addressed filename
+        file_path = write_media_file(portfolio_dir, encoded, user.id, "portfolio")
         
         # Create database record
         media_url = get_media_url(file_path)
@@ -351,7 +328,7 @@ async def _upload_portfolio(
                 width=portfolio_image.width,
                 height=portfolio_image.height,
                 mime_type=portfolio_image.mime_type,
-                created_at=portfolio_image.created_at.isoformat(),
+                created_at=portfolio_image.created_at,
                 title=portfolio_image.title,
                 description=portfolio_image.description,
                 approx_price=portfolio_image.approx_price,
@@ -440,7 +417,7 @@ async def _list_portfolio(user: User, db: Session, kind: Optional[str] = None) -
             width=img.width,
             height=img.height,
             mime_type=img.mime_type,
-            created_at=img.created_at.isoformat(),
+            created_at=img.created_at,
             title=img.title,
             description=img.description,
             approx_price=img.approx_price,
@@ -523,7 +500,7 @@ async def update_portfolio_image_metadata(
         width=portfolio_image.width,
         height=portfolio_image.height,
         mime_type=portfolio_image.mime_type,
-        created_at=portfolio_image.created_at.isoformat(),
+        created_at=portfolio_image.created_at,
         title=portfolio_image.title,
         description=portfolio_image.description,
         approx_price=portfolio_image.approx_price,
@@ -567,24 +544,27 @@ async def upload_model_gallery(
     created_items: List[ModelGalleryItemSchema] = []
     portfolio_dir = get_portfolio_dir(user.id)
 
+    contents: List[bytes] = []
+    mime_types: List[str] = []
     for file in files:
         validate_file(file)
-        content = await file.read()
-        if len(content) > MAX_UPLOAD_SIZE:
-            # Skip oversized files but continue with others
+        try:
+            content = await read_upload_limited(file)
+        except HTTPException:
+            # Skip oversized or non-image files but continue with others
             continue
+        contents.append(content)
+        mime_types.append(file.content_type or "image/webp")
 
-        try:
-            image = Image.open(io.BytesIO(content))
-            processed_image, width, height = process_portfolio(image)
-            mime_type = file.content_type or "image/webp"
-        except Exception:
+    results = await process_portfolio_batch(contents)
+
+    for result, mime_type in zip(results, mime_types):
+        if isinstance(result, BaseException):
             # Skip invalid images
             continue
+        encoded, width, height = result
 
-        filename = generate_safe_filename(user.id, "portfolio", "webp")
-        file_path = portfolio_dir / filename
-        save_image(processed_image, file_path, format="WEBP")
+        file_path = write_media_file(portfolio_dir, encoded, user.id, "portfolio")
 
         media_url = get_media_url(file_path)
         portfolio_image = PortfolioImage(
@@ -1,11 +1,13 @@
 """Model profile and public model routes."""
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from sqlalchemy import func, or_
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from sqlalchemy import bindparam, func, lambda_stmt, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.db.base import get_db
+from app.config import settings
+from app.db.base import SessionLocal, get_db
 from app.models.model import Model
 from app.models.model_gallery_item import ModelGalleryItem as ModelGalleryItemModel
 from app.models.portfolio import PortfolioImage
@@ -13,6 +15,7 @@ from app.models.session import Session as SessionModel
 from app.models.user import AccountType, User
 from app.routes.auth import get_current_session
 from app.schemas.model import (
+    MODEL_CARD_LIST_ADAPTER,
     ModelGalleryItem,
     ModelGalleryListResponse,
     ModelMeResponse,
@@ -21,17 +24,35 @@ from app.schemas.model import (
     PublicModelListResponse,
     PublicModelResponse,
 )
+from app.utils.cache import StaleWhileRevalidateCache
+from app.utils.responses import paginated_json_response
 
 router = APIRouter(prefix="/models", tags=["models"])
 public_router = APIRouter(prefix="/public/models", tags=["public_models"])
 
+# Hot lookups built as lambda statements: constructed and cache-keyed once per
+# process instead of on every request.
+_select_user_by_id = lambda_stmt(lambda: select(User).where(User.id == bindparam("user_id")))
+
+# Find by slug first, then fall back to username for backward compatibility
+_select_public_model = lambda_stmt(
+    lambda: select(Model, User)
+    .join(User, Model.user_id == User.id)
+    .where(
+        or_(Model.slug == bindparam("slug"), User.username == bindparam("slug")),
+        User.account_type == AccountType.MODEL,
+        User.onboarding_completed == True,  # noqa: E712
+    )
+    .limit(1)
+)
+
 
 def get_current_user(
     session: SessionModel = Depends(get_current_session),
     db: Session = Depends(get_db),
 ) -> User:
     """Get current authenticated user from session."""
-    user = db.query(User).filter(User.id == session.user_id).first()
+    user = db.execute(_select_user_by_id, {"user_id": session.user_id}).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,19 +62,26 @@ def get_current_user(
 
 
 def get_or_create_model(user: User, db: Session) -> Model:
-    """Get the Model record for a user, creating it if missing."""
-    model = db.query(Model).filter(Model.user_id == user.id).first()
+    """Get the Model record for a user, creating it if missing.
+
+    The common path is a plain SELECT, so authenticated reads never write.
+    On a miss, ``INSERT ... ON CONFLICT (user_id) DO NOTHING RETURNING``
+    creates the row; if a concurrent request won the race nothing comes
+    back and the row is read again. Missing slugs on existing rows are
+    backfilled by the ``e5f6a7b8c9d0`` data migration, not here.
+    """
+    select_model = select(Model).where(Model.user_id == user.id)
+    model = db.execute(select_model).scalar_one_or_none()
     if model is None:
-        model = Model(user_id=user.id, slug=user.username)
-        db.add(model)
+        model = db.execute(
+            pg_insert(Model)
+            .values(user_id=user.id, slug=user.username)
+            .on_conflict_do_nothing(index_elements=[Model.user_id])
+            .returning(Model)
+        ).scalar_one_or_none()
+        if model is None:
+            model = db.execute(select_model).scalar_one()
         db.commit()
-        db.refresh(model)
-    # Ensure slug exists for public pages
-    if not model.slug:
-        model.slug = user.username
-        db.add(model)
-        db.commit()
-        db.refresh(model)
     # Ensure styles is always a list
     if model.styles is None:
         model.styles = []
@@ -107,19 +135,31 @@ def update_me(
     model = get_or_create_model(user, db)
     data = payload.model_dump(exclude_unset=True)
 
+    # Single UPDATE per table instead of per-attribute ORM change tracking
     onboarding_completed = data.pop("onboarding_completed", None)
     if onboarding_completed is not None:
-        user.onboarding_completed = bool(onboarding_completed)
+        db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(onboarding_completed=bool(onboarding_completed))
+            .execution_options(synchronize_session=False)
+        )
 
-    for field, value in data.items():
-        setattr(model, field, value)
+    if data:
+        db.execute(
+            update(Model)
+            .where(Model.id == model.id)
+            .values(**data)
+            .execution_options(synchronize_session=False)
+        )
 
-    db.add(user)
-    db.add(model)
     db.commit()
-    db.refresh(user)
     db.refresh(model)
 
+    # The public page is cached under whichever identifier it was requested by
+    for key in {model.slug, user.username} - {None}:
+        public_model_cache.invalidate(key)
+
     return build_model_me_response(user, model)
 
 
@@ -173,6 +213,13 @@ def list_my_gallery(
     return ModelGalleryListResponse(items=items)
 
 
+public_model_cache: StaleWhileRevalidateCache[PublicModelResponse] = StaleWhileRevalidateCache(
+    fresh_seconds=settings.public_cache_fresh_seconds,
+    stale_seconds=settings.public_cache_stale_seconds,
+    session_factory=SessionLocal,
+)
+
+
 @public_router.get("/{slug}", response_model=PublicModelResponse)
 def get_public_model(
     slug: str = Path(..., description="Model slug"),
@@ -180,39 +227,21 @@ def get_public_model(
 ):
     """Get public model profile by slug.
     
-    Only returns models who have completed onboarding.
+    Only returns models who have completed onboarding. Responses are cached
+    for a few seconds and served stale while being refreshed.
     """
-    # Try to find by slug first, then fallback to username for backward compatibility
-    model = (
-        db.query(Model)
-        .join(User, Model.user_id == User.id)
-        .filter(
-            or_(Model.slug == slug, User.username == slug),
-            User.account_type == AccountType.MODEL,
-            User.onboarding_completed == True,
-        )
-        .first()
-    )
-    
-    if not model:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Model not found",
-        )
-    
-    user = db.query(User).filter(User.id == model.user_id).first()
-    if not user:
+    return public_model_cache.get(slug, db, _build_public_model_response)
+
+
+def _build_public_model_response(slug: str, db: Session) -> PublicModelResponse:
+    """Build the public model profile response for a slug."""
+    row = db.execute(_select_public_model, {"slug": slug}).first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Model not found",
         )
-    
-    # Ensure slug is set
-    if not model.slug:
-        model.slug = user.username
-        db.add(model)
-        db.commit()
-        db.refresh(model)
+    model, user = row
 
     gallery_items = _build_gallery_items_for_model(model, db)
 
@@ -235,15 +264,27 @@ def list_public_models(
     city: Optional[str] = Query(default=None, description="Filter by city (case-insensitive)"),
     limit: int = Query(default=16, ge=1, le=48),
     offset: int = Query(default=0, ge=0),
-) -> PublicModelListResponse:
+) -> Response:
     """List public models with optional city filter.
 
     Only returns models whose associated user has completed onboarding.
     """
-    base_query = (
-        db.query(User, Model)
+    # Select only the card columns so rows validate straight from their mapping
+    # without hydrating ORM objects.
+    stmt = (
+        select(
+            Model.id,
+            User.username,
+            func.coalesce(func.nullif(Model.slug, ""), User.username).label("slug"),
+            Model.display_name,
+            Model.city,
+            # Bound with the column's own type, so it renders on Postgres and SQLite
+            func.coalesce(Model.styles, literal([], Model.styles.type)).label("styles"),
+            User.avatar_url,
+            User.banner_url,
+        )
         .join(Model, Model.user_id == User.id)
-        .filter(
+        .where(
             User.account_type == AccountType.MODEL,
             User.onboarding_completed == True,  # noqa: E712
         )
@@ -252,43 +293,15 @@ def list_public_models(
     if city:
         city_normalized = city.strip().lower()
         if city_normalized:
-            base_query = base_query.filter(func.lower(Model.city) == city_normalized)
+            stmt = stmt.where(func.lower(Model.city) == city_normalized)
 
-    total = base_query.count()
+    total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
 
-    rows = (
-        base_query.order_by(Model.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-        .all()
-    )
+    rows = db.execute(
+        stmt.order_by(Model.created_at.desc()).limit(limit).offset(offset)
+    ).mappings()
+    items: List[PublicModelCard] = [PublicModelCard.model_validate(row) for row in rows]
 
-    items: List[PublicModelCard] = []
-    for user, model in rows:
-        slug = model.slug or user.username
-        if not model.slug:
-            model.slug = user.username
-            db.add(model)
-        items.append(
-            PublicModelCard(
-                id=model.id,
-                username=user.username,
-                slug=slug,
-                display_name=model.display_name,
-                city=model.city,
-                styles=list(model.styles or []),
-                avatar_url=user.avatar_url,
-                banner_url=user.banner_url,
-            )
-        )
-
-    db.commit()
-
-    return PublicModelListResponse(
-        items=items,
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
+    return paginated_json_response(MODEL_CARD_LIST_ADAPTER, items, total, limit, offset)
 
 
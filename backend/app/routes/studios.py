@@ -1,12 +1,15 @@
 """Studio profile, residents, booking, and public studio routes."""
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from sqlalchemy import distinct, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.db.base import get_db
+from app.config import settings
+from app.db.base import SessionLocal, get_db
+from app.enums import BookingStatus
 from app.models.artist import Artist
 from app.models.artist_studio_resident import ArtistStudioResident
 from app.models.booking_request import BookingRequest
@@ -16,6 +19,7 @@ from app.models.studio import Studio
 from app.models.user import AccountType, User
 from app.routes.auth import get_current_session
 from app.schemas.studio import (
+    STUDIO_CARD_LIST_ADAPTER,
     ArtistInvitationsResponse,
     ArtistInvitationItem,
     ArtistInvitationStudio,
@@ -35,6 +39,8 @@ from app.schemas.studio import (
     StudioResidentsResponse,
     StudioUpdateRequest,
 )
+from app.utils.cache import StaleWhileRevalidateCache
+from app.utils.responses import paginated_json_response
 
 
 router = APIRouter(prefix="/studios", tags=["studios"])
@@ -56,22 +62,53 @@ def get_current_user(
 
 
 def get_or_create_studio(user: User, db: Session) -> Studio:
-    """Get the Studio record for a user, creating it if missing."""
-    studio = db.query(Studio).filter(Studio.user_id == user.id).first()
+    """Get the Studio record for a user, creating it if missing.
+
+    The common path is a plain SELECT, so authenticated reads never write.
+    On a miss, ``INSERT ... ON CONFLICT (user_id) DO NOTHING RETURNING``
+    creates the row; if a concurrent request won the race nothing comes
+    back and the row is read again. Missing slugs on existing rows are
+    backfilled by the ``e5f6a7b8c9d0`` data migration, not here.
+    """
+    select_studio = select(Studio).where(Studio.user_id == user.id)
+    studio = db.execute(select_studio).scalar_one_or_none()
     if studio is None:
-        studio = Studio(user_id=user.id, name=user.username, slug=user.username)
-        db.add(studio)
+        studio = db.execute(
+            pg_insert(Studio)
+            .values(user_id=user.id, name=user.username, slug=user.username)
+            .on_conflict_do_nothing(index_elements=[Studio.user_id])
+            .returning(Studio)
+        ).scalar_one_or_none()
+        if studio is None:
+            studio = db.execute(select_studio).scalar_one()
         db.commit()
-        db.refresh(studio)
-    # Ensure slug exists for public pages
-    if not studio.slug:
-        studio.slug = user.username
-        db.add(studio)
-        db.commit()
-        db.refresh(studio)
     return studio
 
 
+def resolve_studio_by_slug(studio_slug: str, db: Session) -> Optional[Tuple[Studio, User]]:
+    """Resolve a studio and its user by username (primary) or Studio.slug.
+
+    Both lookups are served by one joined query; either branch of the OR is
+    covered by the unique indexes on users.username and studios.slug. When the
+    identifier matches one studio by username and another by slug, the
+    username match wins, as before.
+    """
+    username_match = User.username == studio_slug
+    row = (
+        db.query(Studio, User)
+        .join(User, User.id == Studio.user_id)
+        .filter(
+            User.account_type == AccountType.STUDIO,
+            or_(username_match, Studio.slug == studio_slug),
+        )
+        .order_by(username_match.desc())
+        .first()
+    )
+    if row is None:
+        return None
+    return row[0], row[1]
+
+
 def build_studio_me_response(user: User, studio: Studio) -> StudioMeResponse:
     """Build StudioMeResponse from user and studio models.
 
@@ -112,11 +149,22 @@ def get_me(
     # Self-healing sync for legacy data:
     # If studio.onboarding_completed is True but user.onboarding_completed is False,
     # promote the user flag to True as the global source of truth.
-    if studio.onboarding_completed and not user.onboarding_completed:
-        user.onboarding_completed = True
-        db.add(user)
+    # The check lives in the UPDATE's WHERE clause so the common (already in
+    # sync) case performs no write and the rare mismatch is one statement.
+    result = db.execute(
+        update(User)
+        .where(
+            User.id == user.id,
+            User.onboarding_completed == False,  # noqa: E712
+            exists().where(
+                Studio.user_id == User.id,
+                Studio.onboarding_completed == True,  # noqa: E712
+            ),
+        )
+        .values(onboarding_completed=True)
+    )
+    if result.rowcount:
         db.commit()
-        db.refresh(user)
 
     return build_studio_me_response(user, studio)
 
@@ -137,21 +185,33 @@ def update_me(
     studio = get_or_create_studio(user, db)
     data = payload.model_dump(exclude_unset=True)
 
+    # Single UPDATE per table instead of per-attribute ORM change tracking
     onboarding_completed = data.pop("onboarding_completed", None)
     if onboarding_completed is not None:
         flag = bool(onboarding_completed)
-        studio.onboarding_completed = flag
-        user.onboarding_completed = flag
+        data["onboarding_completed"] = flag
+        db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(onboarding_completed=flag)
+            .execution_options(synchronize_session=False)
+        )
 
-    for field, value in data.items():
-        setattr(studio, field, value)
+    if data:
+        db.execute(
+            update(Studio)
+            .where(Studio.id == studio.id)
+            .values(**data)
+            .execution_options(synchronize_session=False)
+        )
 
-    db.add(user)
-    db.add(studio)
     db.commit()
-    db.refresh(user)
     db.refresh(studio)
 
+    # The public page is cached under whichever identifier it was requested by
+    for key in {studio.slug, user.username} - {None}:
+        public_studio_cache.invalidate(key)
+
     return build_studio_me_response(user, studio)
 
 
@@ -239,7 +299,7 @@ def invite_resident(
 
     artist = db.query(Artist).filter(Artist.user_id == artist_user.id).first()
     if artist is None:
-        artist = Artist(user_id=artist_user.id)
+        artist = Artist(user_id=artist_user.id, slug=artist_user.username)
         db.add(artist)
         db.commit()
         db.refresh(artist)
@@ -284,10 +344,12 @@ def list_booking_requests(
         alias="status",
         description="Optional status filter: new, in_progress, closed",
     ),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """List booking requests for the current studio."""
+    """List booking requests for the current studio (newest first, paginated)."""
     if user.account_type != AccountType.STUDIO:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -297,30 +359,36 @@ def list_booking_requests(
     studio = get_or_create_studio(user, db)
     query = db.query(BookingRequest).filter(BookingRequest.studio_id == studio.id)
     if status_param:
-        if status_param not in ("new", "in_progress", "closed"):
+        try:
+            status_filter = BookingStatus(status_param)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid status filter",
             )
-        query = query.filter(BookingRequest.status == status_param)
-
-    rows = query.order_by(BookingRequest.created_at.desc()).all()
-
-    items = [
-        BookingRequestItem(
-            id=row.id,
-            studio_id=row.studio_id,
-            artist_id=row.artist_id,
-            type=row.type,  # type: ignore[arg-type]
-            client_name=row.client_name,
-            client_contact=row.client_contact,
-            comment=row.comment,
-            status=row.status,  # type: ignore[arg-type]
-            created_at=row.created_at,
-        )
-        for row in rows
-    ]
-    return BookingRequestListResponse(items=items)
+        query = query.filter(BookingRequest.status == status_filter.value)
+
+    # Fetch the page and the total in one round-trip via a window count.
+    rows = (
+        query.add_columns(func.count().over().label("total"))
+        .order_by(BookingRequest.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    if rows:
+        total = rows[0].total
+    else:
+        # Window count is unavailable past the last page; fall back to COUNT.
+        total = query.count() if offset else 0
+
+    items = [BookingRequestItem.model_validate(row) for row, _ in rows]
+    return BookingRequestListResponse(
+        items=items,
+        total=total,
+        limit=limit,
+        offset=offset,
+    )
 
 
 @router.patch(
@@ -355,22 +423,12 @@ def update_booking_request(
             detail="Booking request not found",
         )
 
-    request.status = payload.status
+    request.status = payload.status.value
     db.add(request)
     db.commit()
     db.refresh(request)
 
-    return BookingRequestItem(
-        id=request.id,
-        studio_id=request.studio_id,
-        artist_id=request.artist_id,
-        type=request.type,  # type: ignore[arg-type]
-        client_name=request.client_name,
-        client_contact=request.client_contact,
-        comment=request.comment,
-        status=request.status,  # type: ignore[arg-type]
-        created_at=request.created_at,
-    )
+    return BookingRequestItem.model_validate(request)
 
 
 @public_router.post(
@@ -384,26 +442,13 @@ def create_public_booking_request(
     db: Session = Depends(get_db),
 ):
     """Public endpoint for creating a booking request for a studio."""
-    # Resolve studio by user.username (primary) or Studio.slug as fallback
-    user = (
-        db.query(User)
-        .filter(
-            User.username == studio_slug,
-            User.account_type == AccountType.STUDIO,
-        )
-        .first()
-    )
-    studio: Optional[Studio] = None
-    if user:
-        studio = db.query(Studio).filter(Studio.user_id == user.id).first()
-    else:
-        studio = db.query(Studio).filter(Studio.slug == studio_slug).first()
-
-    if not studio:
+    row = resolve_studio_by_slug(studio_slug, db)
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Studio not found",
         )
+    studio, _ = row
 
     artist_id: Optional[int] = None
     if payload.type == "artist_specific":
@@ -412,17 +457,16 @@ def create_public_booking_request(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="artist_id is required for artist_specific bookings",
             )
-        # Validate artist is an accepted resident
-        residency = (
-            db.query(ArtistStudioResident)
-            .filter(
+        # Validate artist is an accepted resident (existence check only,
+        # no need to hydrate the residency row)
+        is_resident = db.query(
+            exists().where(
                 ArtistStudioResident.studio_id == studio.id,
                 ArtistStudioResident.artist_id == payload.artist_id,
                 ArtistStudioResident.status == "accepted",
             )
-            .first()
-        )
-        if residency is None:
+        ).scalar()
+        if not is_resident:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Artist is not an accepted resident of this studio",
@@ -436,23 +480,20 @@ def create_public_booking_request(
         client_name=payload.client_name,
         client_contact=payload.client_contact,
         comment=payload.comment,
-        status="new",
+        status=BookingStatus.NEW.value,
     )
     db.add(request)
     db.commit()
     db.refresh(request)
 
-    return BookingRequestItem(
-        id=request.id,
-        studio_id=request.studio_id,
-        artist_id=request.artist_id,
-        type=request.type,  # type: ignore[arg-type]
-        client_name=request.client_name,
-        client_contact=request.client_contact,
-        comment=request.comment,
-        status=request.status,  # type: ignore[arg-type]
-        created_at=request.created_at,
-    )
+    return BookingRequestItem.model_validate(request)
+
+
+public_studio_cache: StaleWhileRevalidateCache[PublicStudioResponse] = StaleWhileRevalidateCache(
+    fresh_seconds=settings.public_cache_fresh_seconds,
+    stale_seconds=settings.public_cache_stale_seconds,
+    session_factory=SessionLocal,
+)
 
 
 @public_router.get(
@@ -465,50 +506,25 @@ def get_public_studio(
 ):
     """Get public studio page data by slug/username.
     
-    Only returns studios who have completed onboarding.
+    Only returns studios who have completed onboarding. Responses are cached
+    for a few seconds and served stale while being refreshed.
     """
-    user = (
-        db.query(User)
-        .filter(
-            User.username == studio_slug,
-            User.account_type == AccountType.STUDIO,
-        )
-        .first()
-    )
-    studio: Optional[Studio] = None
-    if user:
-        studio = db.query(Studio).filter(Studio.user_id == user.id).first()
-    else:
-        studio = db.query(Studio).filter(Studio.slug == studio_slug).first()
+    return public_studio_cache.get(studio_slug, db, _build_public_studio_response)
 
-    if not studio or (user is None and studio.user_id is None):
-        # If studio exists without a linked user or no match at all, treat as not found
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Studio not found",
-        )
 
-    if user is None:
-        # Resolve user from studio.user_id
-        user = db.query(User).filter(User.id == studio.user_id).first()
-
-    if user is None:
+def _build_public_studio_response(studio_slug: str, db: Session) -> PublicStudioResponse:
+    """Build the public studio page response for a slug/username."""
+    row = resolve_studio_by_slug(studio_slug, db)
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Studio not found",
         )
-    
-    # Keep studio.onboarding_completed in sync for public visibility.
-    # If the user has completed onboarding but the studio flag is False,
-    # promote the studio flag so that public visibility matches global state.
-    if user.onboarding_completed and not studio.onboarding_completed:
-        studio.onboarding_completed = True
-        db.add(studio)
-        db.commit()
-        db.refresh(studio)
+    studio, user = row
 
-    # Check if studio has completed onboarding
-    if not studio.onboarding_completed:
+    # user.onboarding_completed is the global source of truth; legacy rows may
+    # still have the studio flag unset. Read-only: this runs in cache refreshes.
+    if not (studio.onboarding_completed or user.onboarding_completed):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Studio not found",
@@ -517,7 +533,10 @@ def get_public_studio(
     # Gallery based on portfolio images for the studio's user
     images: List[PortfolioImage] = (
         db.query(PortfolioImage)
-        .filter(PortfolioImage.user_id == user.id)
+        .filter(
+            PortfolioImage.user_id == user.id,
+            PortfolioImage.kind == "portfolio",
+        )
         .all()
     )
     gallery_items: List[PublicStudioPortfolioItem] = [
@@ -528,39 +547,41 @@ def get_public_studio(
             height=img.height,
         )
         for img in images
-        if img.kind == "portfolio"
     ]
 
     # Team: accepted residents only
-    residencies: List[ArtistStudioResident] = (
-        db.query(ArtistStudioResident)
-        .filter(
-            ArtistStudioResident.studio_id == studio.id,
-            ArtistStudioResident.status == "accepted",
-        )
+    accepted_residents = (
+        ArtistStudioResident.studio_id == studio.id,
+        ArtistStudioResident.status == "accepted",
+    )
+    team_rows = (
+        db.query(Artist, User)
+        .join(ArtistStudioResident, ArtistStudioResident.artist_id == Artist.id)
+        .join(User, User.id == Artist.user_id)
+        .filter(*accepted_residents)
         .all()
     )
-    team: List[PublicStudioTeamMember] = []
-    style_set: set[str] = set()
-    for res in residencies:
-        artist = db.query(Artist).filter(Artist.id == res.artist_id).first()
-        if not artist:
-            continue
-        artist_user = db.query(User).filter(User.id == artist.user_id).first()
-        if not artist_user:
-            continue
-        styles_list = list(artist.styles or [])
-        for style in styles_list:
-            style_set.add(style)
-        team.append(
-            PublicStudioTeamMember(
-                artist_id=artist.id,
-                username=artist_user.username,
-                display_name=artist.display_name,
-                avatar_url=artist_user.avatar_url,
-                styles=styles_list,
-            )
+    team: List[PublicStudioTeamMember] = [
+        PublicStudioTeamMember(
+            artist_id=artist.id,
+            username=artist_user.username,
+            display_name=artist.display_name,
+            avatar_url=artist_user.avatar_url,
+            styles=list(artist.styles or []),
         )
+        for artist, artist_user in team_rows
+    ]
+
+    # Distinct styles across the team, flattened and de-duplicated in Postgres
+    team_styles = (
+        select(func.jsonb_array_elements_text(Artist.styles).label("style"))
+        .join(ArtistStudioResident, ArtistStudioResident.artist_id == Artist.id)
+        .where(*accepted_residents, func.jsonb_typeof(Artist.styles) == "array")
+        .subquery()
+    )
+    aggregated_styles: List[str] = (
+        db.execute(select(func.array_agg(distinct(team_styles.c.style)))).scalar() or []
+    )
 
     studio_info = PublicStudioInfo(
         name=studio.name or user.username,
@@ -580,7 +601,7 @@ def get_public_studio(
         banner_url=user.banner_url,
         gallery=gallery_items,
         team=team,
-        aggregated_styles=sorted(style_set),
+        aggregated_styles=sorted(aggregated_styles),
     )
 
 
@@ -590,15 +611,26 @@ def list_public_studios(
     city: Optional[str] = Query(default=None, description="Filter by city (case-insensitive)"),
     limit: int = Query(default=16, ge=1, le=48),
     offset: int = Query(default=0, ge=0),
-) -> PublicStudioListResponse:
+) -> Response:
     """List public studios with optional city filter.
 
     Only returns studios whose associated user has completed onboarding.
     """
-    base_query = (
-        db.query(User, Studio)
+    # Select only the card columns so rows validate straight from their mapping
+    # without hydrating ORM objects.
+    stmt = (
+        select(
+            Studio.id,
+            User.username,
+            func.coalesce(func.nullif(Studio.slug, ""), User.username).label("slug"),
+            func.coalesce(func.nullif(Studio.name, ""), Studio.display_name).label("name"),
+            Studio.city,
+            Studio.session_price_label,
+            User.avatar_url,
+            User.banner_url,
+        )
         .join(Studio, Studio.user_id == User.id)
-        .filter(
+        .where(
             User.account_type == AccountType.STUDIO,
             User.onboarding_completed == True,  # noqa: E712
         )
@@ -607,43 +639,15 @@ def list_public_studios(
     if city:
         city_normalized = city.strip().lower()
         if city_normalized:
-            base_query = base_query.filter(func.lower(Studio.city) == city_normalized)
+            stmt = stmt.where(func.lower(Studio.city) == city_normalized)
 
-    total = base_query.count()
+    total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
 
-    rows = (
-        base_query.order_by(Studio.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-        .all()
-    )
-
-    items: List[PublicStudioCard] = []
-    for user, studio in rows:
-        slug = studio.slug or user.username
-        if not studio.slug:
-            studio.slug = user.username
-            db.add(studio)
-        items.append(
-            PublicStudioCard(
-                id=studio.id,
-                username=user.username,
-                slug=slug,
-                name=studio.name or studio.display_name,
-                city=studio.city,
-                session_price_label=studio.session_price_label,
-                avatar_url=user.avatar_url,
-                banner_url=user.banner_url,
-            )
-        )
-
-    db.commit()
+    rows = db.execute(
+        stmt.order_by(Studio.created_at.desc()).limit(limit).offset(offset)
+    ).mappings()
+    items: List[PublicStudioCard] = [PublicStudioCard.model_validate(row) for row in rows]
 
-    return PublicStudioListResponse(
-        items=items,
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
+    return paginated_json_response(STUDIO_CARD_LIST_ADAPTER, items, total, limit, offset)
 
 
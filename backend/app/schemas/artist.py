@@ -1,10 +1,11 @@
 """Pydantic schemas for artist profile and onboarding."""
-from __future__ import annotations
-
 from typing import List, Literal, Optional
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, computed_field
+from typing_extensions import TypedDict
+
+from app.schemas.base import READ_ONLY_CONFIG
 
 
 class ArtistBase(BaseModel):
@@ -19,7 +20,7 @@ class ArtistBase(BaseModel):
     telegram: Optional[str] = None
 
 
-class ArtistOnboardingStepStatus(BaseModel):
+class ArtistOnboardingStepStatus(TypedDict):
     """Computed onboarding step completion flags for artist."""
 
     about_complete: bool
@@ -37,10 +38,28 @@ class ArtistMeResponse(ArtistBase):
     avatar_url: Optional[str] = None
     banner_url: Optional[str] = None
     onboarding_completed: bool
-    steps: ArtistOnboardingStepStatus
+
+    # Step flags are stored flat (no nested model to validate) and exposed
+    # to clients as the `steps` object only
+    step_about_complete: bool = Field(exclude=True)
+    step_media_complete: bool = Field(exclude=True)
+    step_portfolio_complete: bool = Field(exclude=True)
+    step_wannado_complete: bool = Field(exclude=True)
+    first_incomplete_step: int = Field(exclude=True)
 
     model_config = {"from_attributes": True}
 
+    @computed_field  # type: ignore[misc]
+    @property
+    def steps(self) -> ArtistOnboardingStepStatus:
+        return ArtistOnboardingStepStatus(
+            about_complete=self.step_about_complete,
+            media_complete=self.step_media_complete,
+            portfolio_complete=self.step_portfolio_complete,
+            wannado_complete=self.step_wannado_complete,
+            first_incomplete_step=self.first_incomplete_step,
+        )
+
 
 class ArtistUpdateRequest(ArtistBase):
     """Update payload for current artist (all fields optional)."""
@@ -48,7 +67,12 @@ class ArtistUpdateRequest(ArtistBase):
     onboarding_completed: Optional[bool] = None
 
 
-class PortfolioItem(BaseModel):
+# Items nested in list fields of public page responses are TypedDicts, not
+# models: they are plain dicts at runtime, so N items don't pay for N model
+# instances and validator descents.
+
+
+class PortfolioItem(TypedDict):
     """Public portfolio item representation."""
 
     id: int
@@ -56,21 +80,19 @@ class PortfolioItem(BaseModel):
     width: int
     height: int
     kind: Literal["portfolio", "wannado"]
-    title: Optional[str] = None
-    description: Optional[str] = None
-    approx_price: Optional[str] = None
-    placement: Optional[str] = None
-
-    model_config = {"from_attributes": True}
+    title: Optional[str]
+    description: Optional[str]
+    approx_price: Optional[str]
+    placement: Optional[str]
 
 
-class ArtistStudioShort(BaseModel):
+class ArtistStudioShort(TypedDict):
     """Short studio info for artist public page."""
 
     id: int
     slug: str
     display_name: str
-    avatar_url: Optional[str] = None
+    avatar_url: Optional[str]
 
 
 class PublicArtistResponse(BaseModel):
@@ -89,7 +111,7 @@ class PublicArtistResponse(BaseModel):
     wannado: List[PortfolioItem] = Field(default_factory=list)
     studios: List[ArtistStudioShort] = Field(default_factory=list)
 
-    model_config = {"from_attributes": True}
+    model_config = READ_ONLY_CONFIG
 
 
 class PublicArtistCard(BaseModel):
@@ -106,6 +128,8 @@ class PublicArtistCard(BaseModel):
     avatar_url: Optional[str] = None
     banner_url: Optional[str] = None
 
+    model_config = READ_ONLY_CONFIG
+
 
 class PublicArtistListResponse(BaseModel):
     """Paginated list response for public artists catalog."""
@@ -116,6 +140,10 @@ class PublicArtistListResponse(BaseModel):
     offset: int
 
 
+# Built once at import; catalog routes serialize card lists through it directly
+ARTIST_CARD_LIST_ADAPTER = TypeAdapter(List[PublicArtistCard])
+
+
 class PublicArtistStyle(BaseModel):
     """Available tattoo styles for filters."""
 
@@ -129,4 +157,3 @@ class PublicArtistFiltersResponse(BaseModel):
 
     cities: List[str]
     styles: List[PublicArtistStyle]
-
@@ -0,0 +1,7 @@
+"""Shared configuration for response schemas."""
+from pydantic import ConfigDict
+
+# Public page and catalog card responses are only built and serialized, and
+# the page responses are also cached and shared between requests: freeze them
+# so nothing can mutate one after construction.
+READ_ONLY_CONFIG = ConfigDict(from_attributes=True, frozen=True)
@@ -1,4 +1,6 @@
 """Media-related schemas."""
+from datetime import datetime
+
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -19,7 +21,7 @@ class PortfolioImageResponse(BaseModel):
     width: int
     height: int
     mime_type: str
-    created_at: str
+    created_at: datetime
 
     # Optional metadata fields (may be null / omitted)
     title: Optional[str] = None
@@ -29,6 +31,7 @@ class PortfolioImageResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class PortfolioListResponse(BaseModel):
@@ -1,10 +1,11 @@
 """Pydantic schemas for model profile and public model page."""
-from __future__ import annotations
-
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.schemas.base import READ_ONLY_CONFIG
 
 
 class ModelBase(BaseModel):
@@ -34,16 +35,15 @@ class ModelUpdateRequest(ModelBase):
     onboarding_completed: Optional[bool] = None
 
 
-class ModelGalleryItem(BaseModel):
+# Plain-dict list item (see app.schemas.artist.PortfolioItem)
+class ModelGalleryItem(TypedDict):
     """Gallery item for model private/public views."""
 
     id: int
     image_url: str
-    caption: Optional[str] = None
+    caption: Optional[str]
     created_at: datetime
 
-    model_config = {"from_attributes": True}
-
 
 class ModelGalleryListResponse(BaseModel):
     """List of gallery items for current model."""
@@ -64,7 +64,7 @@ class PublicModelResponse(BaseModel):
     banner_url: Optional[str] = None
     gallery: List[ModelGalleryItem] = []
 
-    model_config = {"from_attributes": True}
+    model_config = READ_ONLY_CONFIG
 
 
 class PublicModelCard(BaseModel):
@@ -79,6 +79,8 @@ class PublicModelCard(BaseModel):
     avatar_url: Optional[str] = None
     banner_url: Optional[str] = None
 
+    model_config = READ_ONLY_CONFIG
+
 
 class PublicModelListResponse(BaseModel):
     """Paginated list response for public models catalog."""
@@ -89,3 +91,5 @@ class PublicModelListResponse(BaseModel):
     offset: int
 
 
+# Built once at import; catalog routes serialize card lists through it directly
+MODEL_CARD_LIST_ADAPTER = TypeAdapter(List[PublicModelCard])
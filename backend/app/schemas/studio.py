@@ -1,11 +1,13 @@
 """Pydantic schemas for studio profile, residents and booking."""
 
-from __future__ import annotations
-
 from datetime import datetime
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.enums import BookingStatus
+from app.schemas.base import READ_ONLY_CONFIG
 
 
 class StudioBase(BaseModel):
@@ -88,17 +90,18 @@ class ArtistInvitationsResponse(BaseModel):
     items: List[ArtistInvitationItem]
 
 
-class PublicStudioTeamMember(BaseModel):
+# Plain-dict list items for the public page (see app.schemas.artist.PortfolioItem)
+class PublicStudioTeamMember(TypedDict):
     """Public team member on studio public page."""
 
     artist_id: int
     username: str
-    display_name: Optional[str] = None
-    avatar_url: Optional[str] = None
-    styles: List[str] = Field(default_factory=list)
+    display_name: Optional[str]
+    avatar_url: Optional[str]
+    styles: List[str]
 
 
-class PublicStudioPortfolioItem(BaseModel):
+class PublicStudioPortfolioItem(TypedDict):
     """Public portfolio item for studio gallery."""
 
     id: int
@@ -130,6 +133,8 @@ class PublicStudioResponse(BaseModel):
     team: List[PublicStudioTeamMember] = Field(default_factory=list)
     aggregated_styles: List[str] = Field(default_factory=list)
 
+    model_config = READ_ONLY_CONFIG
+
 
 class PublicStudioCard(BaseModel):
     """Public-facing studio card for catalog listing."""
@@ -143,6 +148,8 @@ class PublicStudioCard(BaseModel):
     avatar_url: Optional[str] = None
     banner_url: Optional[str] = None
 
+    model_config = READ_ONLY_CONFIG
+
 
 class PublicStudioListResponse(BaseModel):
     """Paginated list response for public studios catalog."""
@@ -153,6 +160,10 @@ class PublicStudioListResponse(BaseModel):
     offset: int
 
 
+# Built once at import; catalog routes serialize card lists through it directly
+STUDIO_CARD_LIST_ADAPTER = TypeAdapter(List[PublicStudioCard])
+
+
 class BookingRequestCreate(BaseModel):
     """Public booking request create payload."""
 
@@ -173,19 +184,22 @@ class BookingRequestItem(BaseModel):
     client_name: str
     client_contact: str
     comment: Optional[str] = None
-    status: Literal["new", "in_progress", "closed"]
+    status: BookingStatus
     created_at: datetime
 
+    model_config = {"from_attributes": True}
+
 
 class BookingRequestListResponse(BaseModel):
-    """List of booking requests for a studio."""
+    """Paginated list of booking requests for a studio."""
 
     items: List[BookingRequestItem]
+    total: int
+    limit: int
+    offset: int
 
 
 class BookingRequestUpdate(BaseModel):
     """Update payload for a booking request (status only)."""
 
-    status: Literal["new", "in_progress", "closed"]
-
-
+    status: BookingStatus
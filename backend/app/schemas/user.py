@@ -1,12 +1,20 @@
 """User Pydantic schemas."""
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated
+
+from pydantic import BaseModel, EmailStr, Field, StringConstraints
 
 
 # Centralized password length constraints for validation
 MIN_PASSWORD_LENGTH = 8
 MAX_PASSWORD_LENGTH = 128
 
+# Length check runs inside pydantic-core rather than a Python validator
+Password = Annotated[
+    str,
+    StringConstraints(min_length=MIN_PASSWORD_LENGTH, max_length=MAX_PASSWORD_LENGTH),
+]
+
 
 # Accept any string here and validate against the AccountType enum
 # in app.models.user.AccountType inside the auth.signup endpoint.
@@ -16,19 +24,10 @@ AccountType = str
 class UserCreate(BaseModel):
     """Schema for user creation (signup)."""
     email: EmailStr
-    password: str = Field(...)
+    password: Password
     username: str = Field(..., min_length=3, max_length=50)
     account_type: str
 
-    @field_validator("password")
-    @classmethod
-    def validate_password_length(cls, v: str) -> str:
-        if not (MIN_PASSWORD_LENGTH <= len(v) <= MAX_PASSWORD_LENGTH):
-            raise ValueError(
-                f"Password must be between {MIN_PASSWORD_LENGTH} and {MAX_PASSWORD_LENGTH} characters long."
-            )
-        return v
-
 
 class UserResponse(BaseModel):
     """Schema for user response."""
@@ -48,16 +47,7 @@ class UserResponse(BaseModel):
 class SignInRequest(BaseModel):
     """Schema for signin request."""
     login: str  # Can be email or username
-    password: str
-
-    @field_validator("password")
-    @classmethod
-    def validate_password_length(cls, v: str) -> str:
-        if not (MIN_PASSWORD_LENGTH <= len(v) <= MAX_PASSWORD_LENGTH):
-            raise ValueError(
-                f"Password must be between {MIN_PASSWORD_LENGTH} and {MAX_PASSWORD_LENGTH} characters long."
-            )
-        return v
+    password: Password
 
 
 class SignInResponse(BaseModel):
@@ -36,35 +36,38 @@ Usage examples (from `backend` directory, after activating the venv):
 import argparse
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Add backend directory to path for imports (when run as a script)
 backend_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from sqlalchemy import inspect, text
+from sqlalchemy import insert, inspect, select, text
 from sqlalchemy.orm import Session
-from alembic import command
-from alembic.config import Config
-from alembic.runtime.migration import MigrationContext
-from alembic.script import ScriptDirectory
 
 from app.db.base import Base, SessionLocal, engine
 from app.config import settings
 
 # Import all models so they are registered with Base.metadata
-from app.models import (  # noqa: F401
-    Artist,
-    ArtistStudioResident,
-    BookingRequest,
-    Model,
-    ModelGalleryItem,
-    PortfolioImage,
-    Session as DbSession,
-    Studio,
-    User,
-)
+from app.models.artist import Artist
+from app.models.artist_studio_resident import ArtistStudioResident  # noqa: F401
+from app.models.booking_request import BookingRequest  # noqa: F401
+from app.models.model import Model  # noqa: F401
+from app.models.model_gallery_item import ModelGalleryItem  # noqa: F401
+from app.models.portfolio import PortfolioImage  # noqa: F401
+from app.models.session import Session as DbSession  # noqa: F401
+from app.models.studio import Studio  # noqa: F401
+from app.models.user import AccountType, User
+
+if TYPE_CHECKING:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+# Alembic is imported lazily inside the helpers below: it is only needed when
+# alembic.ini is present, and pulls in a noticeable amount of import time.
+ALEMBIC_INI_PATH = backend_dir / "alembic.ini"
 
 
 logger = logging.getLogger(__name__)
@@ -78,10 +81,21 @@ def configure_logging() -> None:
     )
 
 
-def get_alembic_config() -> Config:
-    """Get Alembic configuration object."""
-    alembic_ini_path = backend_dir / "alembic.ini"
-    alembic_cfg = Config(str(alembic_ini_path))
+def alembic_ini_exists() -> bool:
+    """Return True if the backend has an Alembic configuration file."""
+    return ALEMBIC_INI_PATH.is_file()
+
+
+@lru_cache(maxsize=1)
+def get_alembic_config() -> "Config":
+    """Get Alembic configuration object.
+
+    Built once per process: parsing alembic.ini is not free and the result is
+    shared by the head lookup, upgrade and stamp steps.
+    """
+    from alembic.config import Config
+
+    alembic_cfg = Config(str(ALEMBIC_INI_PATH))
     # Override sqlalchemy.url with our settings
     alembic_cfg.set_main_option("sqlalchemy.url", settings.inkq_pg_url)
     return alembic_cfg
@@ -89,6 +103,8 @@ def get_alembic_config() -> Config:
 
 def get_current_db_revision() -> Optional[str]:
     """Get the current Alembic revision from the database, if any."""
+    from alembic.runtime.migration import MigrationContext
+
     try:
         with engine.connect() as connection:
             context = MigrationContext.configure(connection)
@@ -99,11 +115,22 @@ def get_current_db_revision() -> Optional[str]:
         return None
 
 
+@lru_cache(maxsize=1)
+def get_script_directory() -> "ScriptDirectory":
+    """Get the Alembic script directory (scans the migrations folder once)."""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(get_alembic_config())
+
+
+@lru_cache(maxsize=1)
 def get_head_revision() -> Optional[str]:
     """Get the head revision from Alembic script directory, if configured."""
+    if not alembic_ini_exists():
+        return None
+
     try:
-        alembic_cfg = get_alembic_config()
-        script = ScriptDirectory.from_config(alembic_cfg)
+        script = get_script_directory()
         head = script.get_current_head()
         return head
     except Exception:
@@ -121,33 +148,23 @@ def drop_all_tables() -> None:
     logger.info("All tables dropped successfully.")
 
 
-def create_all_tables() -> None:
-    """Create all tables defined in SQLAlchemy models (idempotent)."""
-    logger.info("Creating all tables from SQLAlchemy models (if missing)...")
-    Base.metadata.create_all(bind=engine)
-
-    inspector = inspect(engine)
-    tables = inspector.get_table_names()
-    app_tables = [t for t in tables if t != "alembic_version"]
-    app_tables_sorted = ", ".join(sorted(app_tables)) if app_tables else "<none>"
-    logger.info(
-        "Verified application tables (%d): %s",
-        len(app_tables),
-        app_tables_sorted,
-    )
-
+def create_all_tables() -> list[str]:
+    """Create all model tables and apply schema tweaks in one transaction.
 
-def ensure_artist_slug_column() -> None:
-    """Ensure the `slug` column exists on the `artists` table.
-
-    Uses a raw SQL `ALTER TABLE ... ADD COLUMN IF NOT EXISTS` statement so it
-    is safe and idempotent to call even if the column already exists.
+    Runs `create_all` (idempotent), ensures the `artists.slug` column that is
+    not covered by Alembic migrations yet (`ADD COLUMN IF NOT EXISTS`), and
+    lists the resulting application tables, all on a single connection.
+    Returns the sorted application table names.
     """
-    logger.info("Ensuring `slug` column exists on `artists` table...")
-    ddl = text("ALTER TABLE artists ADD COLUMN IF NOT EXISTS slug VARCHAR(255);")
+    logger.info("Creating all tables from SQLAlchemy models (if missing)...")
     with engine.begin() as conn:
-        conn.execute(ddl)
+        Base.metadata.create_all(bind=conn)
+        conn.execute(text("ALTER TABLE artists ADD COLUMN IF NOT EXISTS slug VARCHAR(255);"))
+        tables = inspect(conn).get_table_names()
+
+    app_tables = sorted(t for t in tables if t != "alembic_version")
     logger.info("Verified `artists.slug` column.")
+    return app_tables
 
 
 def run_alembic_upgrade_head() -> None:
@@ -170,6 +187,8 @@ def run_alembic_upgrade_head() -> None:
         current_rev,
         head_rev,
     )
+    from alembic import command
+
     alembic_cfg = get_alembic_config()
     command.upgrade(alembic_cfg, "head")
     logger.info("Alembic migrations applied successfully.")
@@ -182,73 +201,80 @@ def stamp_alembic_head_if_available() -> None:
         # Nothing to stamp
         return
 
+    from alembic import command
+
     logger.info("Stamping Alembic version to head: %s", head_rev)
     alembic_cfg = get_alembic_config()
     command.stamp(alembic_cfg, "head")
     logger.info("Alembic version stamped to head.")
 
 
+# Precomputed `app.routes.auth.hash_password("demo123")` (SHA-256 pre-hash +
+# bcrypt, 12 rounds). Baked in so seeding neither pays the bcrypt cost nor
+# imports the auth router.
+DEMO_PASSWORD_HASH = "$2b$12$sgUnHIXuTX854VW9BRCFTOiHu67FkWb4oY1MwRlEqHJNsAhI95ug."
+
+# Demo profiles with completed onboarding, used to populate the catalog.
+# Extend this list to seed more; rows are inserted in bulk.
+DEMO_ARTISTS = [
+    {
+        "email": "demo-artist@inkq.test",
+        "username": "demo-artist",
+        "artist": {
+            "display_name": "Demo Artist",
+            "about": "A demo artist profile for testing the catalog. Specializes in traditional and blackwork styles.",
+            "styles": ["traditional", "blackwork"],  # JSONB array
+            "city": "Berlin",
+            "session_price": 150,
+            "instagram": "@demo_artist",
+            "telegram": "@demo_artist_tg",
+        },
+    },
+]
+
+
 def seed_base_data(db: Session) -> None:
     """Seed base/reference data.
 
-    Creates a demo artist with completed onboarding for testing the catalog.
-    The explicit `Session` parameter keeps the seeding logic testable and easy to extend.
+    Creates the demo artists from `DEMO_ARTISTS` that do not exist yet, with one
+    multi-row INSERT per table. The explicit `Session` parameter keeps the
+    seeding logic testable and easy to extend.
     """
     logger.info("Running base data seed...")
     
-    from app.models.user import User, AccountType
-    from app.models.artist import Artist
-    
-    # Check if demo artist already exists
-    demo_email = "demo-artist@inkq.test"
-    existing_user = db.query(User).filter(User.email == demo_email).first()
-    if existing_user:
-        logger.info("Demo artist already exists, skipping seed.")
+    # Skip demo artists that already exist
+    emails = [demo["email"] for demo in DEMO_ARTISTS]
+    existing = set(db.execute(select(User.email).where(User.email.in_(emails))).scalars())
+    pending = [demo for demo in DEMO_ARTISTS if demo["email"] not in existing]
+    if not pending:
+        logger.info("Demo artists already exist, skipping seed.")
         return
     
-    # Create demo artist user
-    # Use proper bcrypt hashing
-    from app.routes.auth import hash_password
-    password_hash = hash_password("demo123")
-    
-    demo_user = User(
-        email=demo_email,
-        password_hash=password_hash,
-        username="demo-artist",
-        account_type=AccountType.ARTIST,
-        onboarding_completed=True,
+    user_ids = dict(
+        db.execute(
+            insert(User).returning(User.username, User.id),
+            [
+                {
+                    "email": demo["email"],
+                    "password_hash": DEMO_PASSWORD_HASH,
+                    "username": demo["username"],
+                    "account_type": AccountType.ARTIST,
+                    "onboarding_completed": True,
+                }
+                for demo in pending
+            ],
+        ).all()
     )
-    db.add(demo_user)
-    db.flush()  # Get the user ID
-    
-    # Create artist profile
-    demo_artist = Artist(
-        user_id=demo_user.id,
-        display_name="Demo Artist",
-        about="A demo artist profile for testing the catalog. Specializes in traditional and blackwork styles.",
-        styles=["traditional", "blackwork"],  # JSONB array
-        city="Berlin",
-        session_price=150,
-        instagram="@demo_artist",
-        telegram="@demo_artist_tg",
+    db.execute(
+        insert(Artist),
+        [
+            {"user_id": user_ids[demo["username"]], "slug": demo["username"], **demo["artist"]}
+            for demo in pending
+        ],
     )
-    db.add(demo_artist)
     
     db.commit()
-    logger.info("Demo artist created: %s (email: %s)", demo_user.username, demo_email)
-
-
-def verify_tables() -> None:
-    """Log a summary of the existing application tables."""
-    inspector = inspect(engine)
-    tables = inspector.get_table_names()
-    app_tables = [t for t in tables if t != "alembic_version"]
-    app_tables_sorted = ", ".join(sorted(app_tables)) if app_tables else "<none>"
-    logger.info(
-        "Final application tables in database (%d): %s",
-        len(app_tables),
-        app_tables_sorted,
-    )
+    logger.info("Demo artists created: %s", ", ".join(demo["username"] for demo in pending))
 
 
 def init_db(
@@ -292,22 +318,20 @@ def init_db(
     else:
         logger.info("Alembic not requested; skipping migrations.")
 
-    # Ensure all tables from SQLAlchemy models exist.
-    create_all_tables()
-
-    # Ensure artist-specific schema tweaks that are not covered by Alembic
-    # migrations yet (safe, idempotent ALTER).
-    ensure_artist_slug_column()
+    # Ensure all tables from SQLAlchemy models exist, plus artist-specific
+    # schema tweaks that are not covered by Alembic migrations yet.
+    app_tables = create_all_tables()
 
     # Keep Alembic version in sync when Alembic is configured at all.
-    try:
-        stamp_alembic_head_if_available()
-    except Exception as exc:
-        logger.warning(
-            "Could not stamp Alembic version to head (%s). "
-            "Database tables are created but Alembic metadata may be out of sync.",
-            exc,
-        )
+    if alembic_ini_exists():
+        try:
+            stamp_alembic_head_if_available()
+        except Exception as exc:
+            logger.warning(
+                "Could not stamp Alembic version to head (%s). "
+                "Database tables are created but Alembic metadata may be out of sync.",
+                exc,
+            )
 
     # Optional seeding step.
     if seed:
@@ -321,7 +345,11 @@ def init_db(
     else:
         logger.info("Seeding not requested; skipping base data seed.")
 
-    verify_tables()
+    logger.info(
+        "Final application tables in database (%d): %s",
+        len(app_tables),
+        ", ".join(app_tables) if app_tables else "<none>",
+    )
     logger.info("Database initialization complete.")
 
 
@@ -0,0 +1,98 @@
+"""In-process stale-while-revalidate cache for public responses."""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StaleWhileRevalidateCache(Generic[T]):
+    """Cache entries as ``(payload, fresh_until, stale_until)``.
+
+    Fresh hits are served as-is. Hits past ``fresh_until`` but before
+    ``stale_until`` are served immediately while a single background thread
+    recomputes the entry, so an expiring popular key does not send every
+    concurrent request into the same heavy query. Misses compute inline with
+    the request's session; refreshes open their own from ``session_factory``.
+    Without a factory, stale hits are recomputed inline like misses.
+
+    ``compute`` must only read: a refresh runs outside any request.
+    """
+
+    def __init__(
+        self,
+        fresh_seconds: float,
+        stale_seconds: float,
+        session_factory: Optional[Callable[[], Session]] = None,
+        maxsize: int = 1024,
+    ):
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.session_factory = session_factory
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[T, float, float]] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, db: Session, compute: Callable[[Hashable, Session], T]) -> T:
+        """Return the cached payload for ``key``, computing it with ``compute(key, db)``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, fresh_until, stale_until = entry
+                if now < fresh_until:
+                    return payload
+                if now < stale_until and self.session_factory is not None:
+                    # Only one refresh per key in flight
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh, args=(key, compute), daemon=True
+                        ).start()
+                    return payload
+
+        payload = compute(key, db)
+        self._store(key, payload)
+        return payload
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: Hashable, payload: T) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order: evict the oldest entry
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (
+                payload,
+                now + self.fresh_seconds,
+                now + self.fresh_seconds + self.stale_seconds,
+            )
+
+    def _refresh(self, key: Hashable, compute: Callable[[Hashable, Session], T]) -> None:
+        db = self.session_factory()
+        try:
+            self._store(key, compute(key, db))
+        except Exception:
+            # The entry may have gone away (e.g. 404); let the next miss decide
+            self.invalidate(key)
+            logger.debug("Background refresh failed for %r", key, exc_info=True)
+        finally:
+            db.close()
+            with self._lock:
+                self._refreshing.discard(key)
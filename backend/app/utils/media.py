@@ -1,10 +1,19 @@
 """Media handling utilities for image processing and storage."""
+import asyncio
+import hashlib
+import io
+import multiprocessing
 import os
-import secrets
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from PIL import Image
-from fastapi import UploadFile, HTTPException, status
+from fastapi import UploadFile, HTTPException, Response, status
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
 from app.config import settings
 
 # Supported image MIME types
@@ -18,53 +27,186 @@ ALLOWED_MIME_TYPES = {
 # Max upload size in bytes
 MAX_UPLOAD_SIZE = settings.max_upload_size_mb * 1024 * 1024
 
+# Media files are content-addressed, so their URLs can be cached forever
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
+# Uploads are read in chunks of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Decoding, resampling and encoding uploads is CPU-bound and holds the GIL, so
+# it runs in worker processes instead of on the event loop. Workers are
+# spawned (not forked) so they never inherit locks held by server threads.
+# The pool is created on first use and dropped on shutdown, so a later
+# startup (a reload, or a TestClient entered again) gets a fresh one.
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the media process pool, creating it if needed."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.media_process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the media worker processes; the next upload starts a new pool."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Directory helpers only compute paths; `write_media_file` creates the
+# directory when it writes, so a removed or remounted directory is recreated
+# instead of being trusted from a cached mkdir.
+@lru_cache(maxsize=1)
 def get_media_root() -> Path:
-    """Get the media root directory, creating it if it doesn't exist."""
-    root = Path(settings.media_root)
-    root.mkdir(parents=True, exist_ok=True)
-    return root
+    """Get the media root directory."""
+    return Path(settings.media_root)
 
 
+@lru_cache(maxsize=1)
 def get_avatars_dir() -> Path:
     """Get the avatars directory."""
-    dir_path = get_media_root() / "avatars"
-    dir_path.mkdir(parents=True, exist_ok=True)
-    return dir_path
+    return get_media_root() / "avatars"
 
 
+@lru_cache(maxsize=1)
 def get_banners_dir() -> Path:
     """Get the banners directory."""
-    dir_path = get_media_root() / "banners"
-    dir_path.mkdir(parents=True, exist_ok=True)
-    return dir_path
+    return get_media_root() / "banners"
 
 
 def get_portfolio_dir(user_id: int) -> Path:
     """Get the portfolio directory for a specific user."""
-    dir_path = get_media_root() / "portfolio" / f"user_{user_id}"
-    dir_path.mkdir(parents=True, exist_ok=True)
-    return dir_path
+    return get_media_root() / "portfolio" / f"user_{user_id}"
+
+
+def _unsupported_file_type() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Unsupported file type. Allowed types: {', '.join(ALLOWED_MIME_TYPES)}"
+    )
 
 
 def validate_file(file: UploadFile) -> None:
-    """Validate uploaded file type and size."""
+    """Validate the declared upload type (size and content are checked by `read_upload_limited`)."""
     # Check MIME type
     if file.content_type not in ALLOWED_MIME_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=f"Unsupported file type. Allowed types: {', '.join(ALLOWED_MIME_TYPES)}"
-        )
-    
-    # Check file size (we need to read the file to check size)
-    # This will be done in the route handler after reading the file
+        raise _unsupported_file_type()
+
+
+def sniff_image_format(head: bytes) -> Optional[str]:
+    """Return "JPEG", "PNG" or "WEBP" from a file's leading bytes, or None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+async def read_upload_limited(file: UploadFile, max_bytes: int = MAX_UPLOAD_SIZE) -> bytes:
+    """
+    Read an upload in chunks, enforcing the size limit and the real image format.
+
+    Raises 413 as soon as more than ``max_bytes`` have been read, so oversized
+    uploads are never held in memory in full, and 415 when the leading bytes
+    are not a JPEG, PNG or WebP signature (``content_type`` is client-declared).
+    """
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {max_bytes / (1024 * 1024)} MB"
+            )
 
+    # Single join: no growing buffer and no final bytes() copy
+    content = b"".join(chunks)
+    if sniff_image_format(content[:32]) is None:
+        raise _unsupported_file_type()
+    return content
 
-def generate_safe_filename(user_id: int, prefix: str = "", extension: str = "webp") -> str:
-    """Generate a safe filename for uploaded media."""
-    timestamp = int(secrets.token_hex(4), 16)  # Random 4-byte hex as timestamp-like identifier
+
+def content_addressed_filename(
+    data: bytes, user_id: int, prefix: str = "", extension: str = "webp"
+) -> str:
+    """Name a user's media file after a hash of its bytes, so its URL never changes content.
+
+    The user id stays in the name, so identical uploads by different users
+    never share (and can never delete) one file.
+    """
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
     safe_prefix = f"{prefix}_" if prefix else ""
-    return f"{safe_prefix}user_{user_id}_{timestamp}.{extension}"
+    return f"{safe_prefix}user_{user_id}_{digest}.{extension}"
+
+
+def write_media_file(
+    directory: Path, data: bytes, user_id: int, prefix: str = "", extension: str = "webp"
+) -> Path:
+    """Write encoded media under its content-addressed name and return the path.
+
+    Identical content maps to the same file, which is then left untouched.
+    The bytes go to a temporary file in ``directory`` first and are renamed
+    into place, so a concurrent identical upload never serves a partial file.
+    """
+    file_path = directory / content_addressed_filename(data, user_id, prefix, extension)
+    if file_path.exists():
+        return file_path
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        # mkstemp creates files as 0600; media is served by other processes
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return file_path
+
+
+def pre_downscale(image: Image.Image, target_width: int, target_height: int) -> None:
+    """
+    Ask the JPEG decoder to decode at a reduced scale (1/2, 1/4 or 1/8).
+
+    libjpeg can scale in the DCT domain, which is far cheaper than decoding
+    full resolution and resampling all of it. The scale is chosen so that the
+    center-crop region still has at least twice the target pixels in each
+    direction, leaving LANCZOS the final step. No-op for non-JPEG images or
+    images that are already loaded.
+    """
+    if image.format != "JPEG":
+        return
+
+    target_aspect = target_width / target_height
+    crop_width = min(image.width, image.height * target_aspect)
+    crop_height = min(image.height, image.width / target_aspect)
+    factor = 2 * max(target_width / crop_width, target_height / crop_height)
+    if factor >= 1:
+        return
+
+    try:
+        image.draft(None, (int(image.width * factor) + 1, int(image.height * factor) + 1))
+    except Exception:
+        # draft is only a hint; fall back to a full decode
+        pass
 
 
 def normalize_image(
@@ -94,18 +236,23 @@ def normalize_image(
             # Image is wider, crop width
             new_width = int(image.height * target_aspect)
             left = (image.width - new_width) // 2
-            image = image.crop((left, 0, left + new_width, image.height))
+            box = (left, 0, left + new_width, image.height)
         else:
             # Image is taller, crop height
             new_height = int(image.width / target_aspect)
             top = (image.height - new_height) // 2
-            image = image.crop((0, top, image.width, top + new_height))
+            box = (0, top, image.width, top + new_height)
         
-        # Resize to target dimensions
-        image = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        # Crop and resize in one resampling pass (no intermediate cropped copy)
+        image = image.resize((target_width, target_height), Image.Resampling.LANCZOS, box=box)
     else:
-        # Fit mode: resize maintaining aspect ratio, then pad
-        image.thumbnail((target_width, target_height), Image.Resampling.LANCZOS)
+        # Fit mode: resize maintaining aspect ratio (never enlarging), then pad.
+        # One explicit resample instead of thumbnail(), which also mutated
+        # the caller's image in place.
+        scale = min(target_width / image.width, target_height / image.height)
+        if scale < 1:
+            new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(new_size, Image.Resampling.LANCZOS)
         new_image = Image.new("RGB", (target_width, target_height), (255, 255, 255))
         paste_x = (target_width - image.width) // 2
         paste_y = (target_height - image.height) // 2
@@ -115,14 +262,31 @@ def normalize_image(
     return image
 
 
+def _center_crop_square(image: Image.Image, size: int) -> Image.Image:
+    """
+    Square center crop + resize in one resample.
+
+    Same result as ``normalize_image(image, size, size)``, with the crop box
+    worked out in integers instead of comparing float aspect ratios.
+    """
+    side = min(image.size)
+    left = (image.width - side) // 2
+    top = (image.height - side) // 2
+    return image.resize(
+        (size, size), Image.Resampling.LANCZOS, box=(left, top, left + side, top + side)
+    )
+
+
 def process_avatar(image: Image.Image) -> Tuple[Image.Image, int, int]:
     """Process image for avatar: normalize to 400x400."""
-    normalized = normalize_image(image, 400, 400, crop_mode="center")
+    pre_downscale(image, 400, 400)
+    normalized = _center_crop_square(image, 400)
     return normalized, 400, 400
 
 
 def process_banner(image: Image.Image) -> Tuple[Image.Image, int, int]:
     """Process image for banner: normalize to ~1584x396 (4:1 aspect)."""
+    pre_downscale(image, 1584, 396)
     normalized = normalize_image(image, 1584, 396, crop_mode="center")
     return normalized, 1584, 396
 
@@ -135,29 +299,113 @@ def process_portfolio(image: Image.Image) -> Tuple[Image.Image, int, int]:
     aspect = image.width / image.height
     if aspect >= 1.0:
         # Wide or square: use 1200x627
+        pre_downscale(image, 1200, 627)
         normalized = normalize_image(image, 1200, 627, crop_mode="center")
         return normalized, 1200, 627
     else:
         # Tall: use 1200x1200 (square)
+        pre_downscale(image, 1200, 1200)
         normalized = normalize_image(image, 1200, 1200, crop_mode="center")
         return normalized, 1200, 1200
 
 
-def save_image(image: Image.Image, file_path: Path, format: str = "WEBP", quality: int = 85) -> None:
-    """Save PIL Image to file path."""
-    # Convert RGBA to RGB if needed (for JPEG compatibility)
-    if image.mode == "RGBA" and format == "JPEG":
+def encode_image(
+    image: Image.Image,
+    format: str = "WEBP",
+    quality: int = 85,
+    method: Optional[int] = None,
+) -> bytes:
+    """Encode PIL Image to bytes.
+
+    ``method`` is the libwebp effort level (defaults to ``settings.webp_method``);
+    it is ignored for other formats.
+    """
+    buffer = io.BytesIO()
+    if format == "WEBP":
+        # WebP takes RGB/RGBA as-is (and converts other modes itself), so
+        # skip the flatten/convert copy. optimize is a no-op for WebP; method
+        # trades encode time for size.
+        image.save(
+            buffer,
+            format=format,
+            quality=quality,
+            method=settings.webp_method if method is None else method,
+        )
+        return buffer.getvalue()
+
+    # JPEG has no alpha: flatten RGBA onto white
+    if image.mode == "RGBA":
         rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-        rgb_image.paste(image, mask=image.split()[3])  # Use alpha channel as mask
+        rgb_image.paste(image, mask=image)  # RGBA mask uses the alpha band, no split() copies
         image = rgb_image
     elif image.mode not in ("RGB", "L"):
         image = image.convert("RGB")
-    
-    image.save(file_path, format=format, quality=quality, optimize=True)
+    image.save(buffer, format=format, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+_UPLOAD_PROCESSORS = {
+    "avatar": process_avatar,
+    "banner": process_banner,
+    "portfolio": process_portfolio,
+}
+
+
+def process_upload_bytes(kind: str, image_bytes: bytes) -> Tuple[bytes, int, int]:
+    """
+    Decode, normalize and WEBP-encode an uploaded image.
+
+    Takes and returns plain bytes so it can run in a worker process without
+    pickling PIL images. The compressed upload is also far smaller than its
+    decoded pixels, so it is what crosses the process boundary; decoding
+    happens once, in the worker. ``kind`` is "avatar", "banner" or "portfolio".
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    processed_image, width, height = _UPLOAD_PROCESSORS[kind](image)
+    method = settings.webp_method_portfolio if kind == "portfolio" else settings.webp_method
+    return encode_image(processed_image, format="WEBP", method=method), width, height
+
+
+async def process_upload_async(kind: str, image_bytes: bytes) -> Tuple[bytes, int, int]:
+    """Run `process_upload_bytes` in the media process pool."""
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    return await loop.run_in_executor(pool, process_upload_bytes, kind, image_bytes)
+
+
+async def process_portfolio_batch(
+    images_bytes: List[bytes],
+) -> List[Union[Tuple[bytes, int, int], BaseException]]:
+    """Process a batch of portfolio uploads in parallel across the process pool.
+
+    Results keep the input order; an image that fails to process comes back as
+    its exception so the caller can skip it without losing the rest.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    futures = [
+        loop.run_in_executor(pool, process_upload_bytes, "portfolio", image_bytes)
+        for image_bytes in images_bytes
+    ]
+    return await asyncio.gather(*futures, return_exceptions=True)
+
+
+@lru_cache(maxsize=1)
+def _media_root_prefix() -> str:
+    """Media root as a string ending in a path separator."""
+    return os.path.join(str(get_media_root()), "")
 
 
 def get_media_url(file_path: Path) -> str:
     """Convert file path to media URL."""
+    # Fast path: paths built from get_media_root() share its string prefix
+    path_str = str(file_path)
+    root_prefix = _media_root_prefix()
+    if path_str.startswith(root_prefix):
+        # Use forward slashes for URLs
+        url_path = path_str[len(root_prefix):].replace("\\", "/")
+        return f"{settings.media_url_prefix}/{url_path}"
+
     # Get relative path from media root
     media_root = get_media_root()
     try:
@@ -169,3 +417,39 @@ def get_media_url(file_path: Path) -> str:
         # If path is not under media_root, return as-is
         return str(file_path)
 
+
+class MediaStaticFiles(StaticFiles):
+    """
+    Static files app for the media root.
+
+    With ``accel_redirect_prefix`` set, file responses are empty and carry an
+    ``X-Accel-Redirect`` header to that internal location, so a fronting nginx
+    sends the file with sendfile(2) instead of the app copying it through
+    Python. Without it, files are served as usual. Either way responses carry
+    ``MEDIA_CACHE_CONTROL``.
+    """
+
+    def __init__(self, *args, accel_redirect_prefix: Optional[str] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/") if accel_redirect_prefix else None
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if self.accel_redirect_prefix is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers["Cache-Control"] = MEDIA_CACHE_CONTROL
+            return response
+        relative_path = self.get_path(scope).replace(os.sep, "/")
+        return Response(
+            status_code=status_code,
+            headers={
+                "X-Accel-Redirect": f"{self.accel_redirect_prefix}/{relative_path}",
+                # nginx passes Cache-Control from the upstream response through
+                "Cache-Control": MEDIA_CACHE_CONTROL,
+            },
+        )
@@ -0,0 +1,81 @@
+"""N+1 query detection for development.
+
+Wires the optional ``nplusone`` package into the FastAPI app so lazy loads
+such as ``residency.artist`` or ``artist.user`` inside a loop are reported
+per request. nplusone only ships Flask/Django integrations, so this module
+provides the request scoping: each request gets its own listeners, keyed by
+a context variable that follows the request into the threadpool where sync
+route handlers run.
+"""
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger("nplusone")
+
+_current_request: ContextVar[Optional[object]] = ContextVar("nplusone_request", default=None)
+
+
+class _RequestScope:
+    """Per-request sender for nplusone signals."""
+
+
+def install_nplusone(app: FastAPI, raise_: bool = False) -> bool:
+    """Install N+1 detection middleware on ``app``.
+
+    Must run before the first query configures the mappers, since SQLAlchemy
+    binds the lazy loader nplusone patches at that point. Returns False (and
+    does nothing) if nplusone is not installed.
+    """
+    try:
+        import blinker
+        from nplusone.core import exceptions, listeners, signals
+        from nplusone.ext import sqlalchemy as nplusone_sqlalchemy  # patches SQLAlchemy loaders
+    except ImportError:
+        logger.info("nplusone not installed; N+1 detection disabled")
+        return False
+
+    signals.get_worker = lambda *args, **kwargs: _current_request.get() or blinker.ANY
+
+    # nplusone records loaded rows from Query.__iter__, which SQLAlchemy 2.0's
+    # Query.all() no longer goes through; emit the same signal from all().
+    original_all = Query.all
+
+    def query_all(self):
+        ret = original_all(self)
+        signals.load.send(
+            signals.get_worker(),
+            args=(self,),
+            ret=ret,
+            parser=nplusone_sqlalchemy.parse_load,
+        )
+        return ret
+
+    Query.all = query_all
+
+    class Profiler:
+        """Collects listeners for one request and reports their findings."""
+
+        def notify(self, message) -> None:
+            if raise_:
+                raise exceptions.NPlusOneError(message.message)
+            logger.warning(message.message)
+
+    @app.middleware("http")
+    async def nplusone_middleware(request: Request, call_next):
+        token = _current_request.set(_RequestScope())
+        profiler = Profiler()
+        active = {name: listener_type(profiler) for name, listener_type in listeners.listeners.items()}
+        for listener in active.values():
+            listener.setup()
+        try:
+            return await call_next(request)
+        finally:
+            for listener in active.values():
+                listener.teardown()
+            _current_request.reset(token)
+
+    return True
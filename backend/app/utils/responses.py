@@ -0,0 +1,45 @@
+"""Pre-serialized JSON responses for hot list endpoints."""
+from typing import Any, Callable, Iterable, Sequence
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def paginated_json_response(
+    adapter: TypeAdapter,
+    items: Sequence[Any],
+    total: int,
+    limit: int,
+    offset: int,
+) -> Response:
+    """Render an ``{items, total, limit, offset}`` page straight to JSON bytes.
+
+    ``adapter`` is a module-level ``TypeAdapter`` for the item list, so the
+    serializer is built once instead of per request. Null item fields are
+    omitted, matching the catalog endpoints' payload contract.
+    """
+    body = (
+        b'{"items":'
+        + adapter.dump_json(items, exclude_none=True)
+        + b',"total":%d,"limit":%d,"offset":%d}' % (total, limit, offset)
+    )
+    return Response(content=body, media_type="application/json")
+
+
+def items_json_response(
+    rows: Iterable[Any],
+    to_item: Callable[[Any], dict],
+) -> Response:
+    """Render an ``{items}`` list straight to JSON bytes with orjson.
+
+    ``to_item`` turns a row into a plain, orjson-serializable dict, so no
+    model instances are built for long lists. ``None`` values are omitted,
+    like ``paginated_json_response`` does. Rows should already be fetched:
+    the body is rendered here, while the request's session is still open.
+    """
+    items = [
+        {key: value for key, value in to_item(row).items() if value is not None}
+        for row in rows
+    ]
+    return Response(content=orjson.dumps({"items": items}), media_type="application/json")
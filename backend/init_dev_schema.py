@@ -29,7 +29,9 @@ from app.models import (  # noqa: F401
 
 def main() -> None:
     print("Initializing dev schema using:", engine.url)
-    Base.metadata.create_all(bind=engine)
+    # One connection and transaction for the existence checks and all DDL
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn, checkfirst=True)
     print("Schema initialization complete.")
 
 
@@ -7,7 +7,8 @@ Usage (from backend directory):
 This will print:
   - the configured INKQ_PG_URL
   - list of tables in the public schema
-  - whether the `users` table is accessible
+  - whether the `users` table is readable
+  - the most recent sessions, if the `sessions` table exists
 """
 
 from sqlalchemy import create_engine, text
@@ -21,22 +22,32 @@ def main() -> None:
     engine = create_engine(settings.inkq_pg_url)
 
     with engine.connect() as conn:
-        # List public tables
-        rows = conn.execute(
-            text("SELECT tablename FROM pg_tables WHERE schemaname = 'public'")
-        ).fetchall()
-        tables = [r[0] for r in rows]
+        # Tables plus users/sessions probes in one round-trip. to_regclass is
+        # NULL for a missing table, and has_table_privilege is NULL for NULL.
+        tables, users_readable, sessions_exists = conn.execute(
+            text(
+                """
+                SELECT
+                    (SELECT array_agg(tablename ORDER BY tablename)
+                     FROM pg_tables WHERE schemaname = 'public') AS tables,
+                    has_table_privilege(to_regclass('public.users'), 'SELECT') AS users_readable,
+                    to_regclass('public.sessions') IS NOT NULL AS sessions_exists
+                """
+            )
+        ).one()
+        tables = tables or []
         print("Public tables:", tables)
 
         # Check users table specifically
-        try:
-            conn.execute(text("SELECT 1 FROM users LIMIT 1"))
-            print("Users table: OK (query succeeded)")
-        except Exception as exc:
-            print("Users table error:", repr(exc))
-
-        # Check sessions table and show a sample session if present
-        if "sessions" in tables:
+        if users_readable:
+            print("Users table: OK (readable)")
+        elif users_readable is None:
+            print("Users table error: table not found")
+        else:
+            print("Users table error: no SELECT privilege")
+
+        # Show a sample session if the sessions table is present
+        if sessions_exists:
             rows = conn.execute(
                 text("SELECT id, user_id, expires_at FROM sessions ORDER BY created_at DESC LIMIT 3")
             ).fetchall()
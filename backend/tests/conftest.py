@@ -0,0 +1,353 @@
+"""Shared database and client fixtures for the test suite."""
+import hashlib
+import os
+from typing import Dict, Optional
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, create_mock_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Fail any request that lazy-loads in a loop (N+1); read when app.config loads
+os.environ.setdefault("NPLUSONE_ENABLED", "1")
+os.environ.setdefault("NPLUSONE_RAISE", "1")
+
+from app.main import app
+from app.db.base import Base, get_db
+from app.config import settings
+from app.models.user import AccountType, User
+from app.routes import auth
+from app.routes.artists import public_artist_filters_cache
+from app.routes.models import public_model_cache
+from app.routes.studios import public_studio_cache
+
+# TEST_USE_SQLITE=1 runs the suite against an in-memory SQLite database;
+# tests marked `postgres` need Postgres-only SQL and are skipped there.
+USE_SQLITE = os.getenv("TEST_USE_SQLITE") == "1"
+
+# Under pytest-xdist each worker runs against its own Postgres database,
+# cloned from a template database that holds the schema
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+WORKER_DATABASE: Optional[str] = None
+TEMPLATE_DATABASE: Optional[str] = None
+if XDIST_WORKER and not USE_SQLITE:
+    _database = make_url(settings.inkq_pg_url).database
+    TEMPLATE_DATABASE = f"{_database}_test_template"
+    WORKER_DATABASE = f"{_database}_test_{XDIST_WORKER}"
+
+# Sessions are bound to each test's connection in `db_session`
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def _create_test_engine() -> Engine:
+    """Engine for this run (or xdist worker); built lazily by the `engine` fixture."""
+    if USE_SQLITE:
+        # One shared connection, so every session sees the same in-memory DB
+        sqlite_engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+
+        @event.listens_for(sqlite_engine, "connect")
+        def _sqlite_connect(dbapi_connection, connection_record):
+            # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(sqlite_engine, "begin")
+        def _sqlite_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+        return sqlite_engine
+
+    # Create test database (for local dev we reuse the main DB URL)
+    url = make_url(settings.inkq_pg_url)
+    if WORKER_DATABASE:
+        url = url.set(database=WORKER_DATABASE)
+    # The default QueuePool already keeps released connections warm, so each
+    # test reuses one instead of reconnecting. No pool_pre_ping: it would add
+    # a round-trip to every checkout.
+    return create_engine(url)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip Postgres-only tests when running against SQLite."""
+    if not USE_SQLITE:
+        return
+    skip_postgres = pytest.mark.skip(reason="needs Postgres (TEST_USE_SQLITE=1)")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip_postgres)
+
+
+# Password -> bcrypt hash, filled on first use during the run
+_password_hash_cache: Dict[str, str] = {}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Use the minimum bcrypt cost and hash each test password only once.
+
+    Tests sign up many users with the same few passwords. Only hashing is
+    memoized; `verify_password` still checks against a real bcrypt hash,
+    whose cost of 4 rounds keeps every signin cheap as well.
+    """
+    original_hash_password = auth.hash_password
+
+    def hash_password(password: str) -> str:
+        if password not in _password_hash_cache:
+            _password_hash_cache[password] = original_hash_password(password)
+        return _password_hash_cache[password]
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 4)
+        monkeypatch.setattr(auth, "hash_password", hash_password)
+        yield
+
+
+# Dialect name -> the CREATE statements `create_all` would emit, captured once
+_schema_ddl_cache: Dict[str, str] = {}
+
+
+def _schema_ddl(engine: Engine) -> str:
+    """DDL for the current models as one script, recorded from a mock engine.
+
+    Recording `create_all` (rather than compiling `CreateTable` per table)
+    also captures the Postgres enum types the tables depend on.
+    """
+    name = engine.dialect.name
+    if name not in _schema_ddl_cache:
+        statements = []
+
+        def record(sql, *multiparams, **params):
+            statements.append(str(sql.compile(dialect=mock_engine.dialect)).strip())
+
+        mock_engine = create_mock_engine(engine.url, record)
+        Base.metadata.create_all(mock_engine, checkfirst=False)
+        _schema_ddl_cache[name] = ";\n".join(statements) + ";"
+    return _schema_ddl_cache[name]
+
+
+def _schema_fingerprint(engine: Engine) -> str:
+    """Hash of the DDL for the current models; changes whenever the schema does."""
+    return hashlib.sha256(_schema_ddl(engine).encode("utf-8")).hexdigest()
+
+
+def _clone_worker_database(engine: Engine) -> None:
+    """Create this worker's database as a copy of the schema template.
+
+    The template is built from the recorded DDL script, in one round-trip
+    and without `create_all`'s per-table existence probes, only when missing
+    or when the models changed since it was built (its comment stores the
+    schema fingerprint), so later runs copy it at the file level instead of
+    re-running DDL. An advisory lock keeps workers from racing on it.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    template, worker = quote(TEMPLATE_DATABASE), quote(WORKER_DATABASE)
+    fingerprint = _schema_fingerprint(engine)
+    server_engine = create_engine(settings.inkq_pg_url, isolation_level="AUTOCOMMIT")
+    try:
+        with server_engine.connect() as conn:
+            lock_key = {"name": TEMPLATE_DATABASE}
+            conn.execute(text("SELECT pg_advisory_lock(hashtext(:name))"), lock_key)
+            try:
+                current = conn.execute(
+                    text(
+                        "SELECT shobj_description(oid, 'pg_database') "
+                        "FROM pg_database WHERE datname = :name"
+                    ),
+                    lock_key,
+                ).scalar()
+                if current != fingerprint:
+                    conn.execute(text(f"DROP DATABASE IF EXISTS {template}"))
+                    conn.execute(text(f"CREATE DATABASE {template}"))
+                    template_engine = create_engine(engine.url.set(database=TEMPLATE_DATABASE))
+                    try:
+                        with template_engine.begin() as template_conn:
+                            template_conn.exec_driver_sql(_schema_ddl(engine))
+                    finally:
+                        template_engine.dispose()
+                    conn.execute(text(f"COMMENT ON DATABASE {template} IS '{fingerprint}'"))
+                conn.execute(text(f"DROP DATABASE IF EXISTS {worker}"))
+                conn.execute(text(f"CREATE DATABASE {worker} TEMPLATE {template}"))
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), lock_key)
+    finally:
+        server_engine.dispose()
+
+
+def _drop_worker_database(engine: Engine) -> None:
+    """Drop this worker's database; the template is kept for the next run."""
+    engine.dispose()
+    server_engine = create_engine(settings.inkq_pg_url, isolation_level="AUTOCOMMIT")
+    try:
+        with server_engine.connect() as conn:
+            database = engine.dialect.identifier_preparer.quote(WORKER_DATABASE)
+            conn.execute(text(f"DROP DATABASE IF EXISTS {database}"))
+    finally:
+        server_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Engine for this run, created on first use rather than at import."""
+    test_engine = _create_test_engine()
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def db_schema(engine):
+    """Create the schema once for the whole test run (or xdist worker)."""
+    if WORKER_DATABASE:
+        _clone_worker_database(engine)
+        yield
+        _drop_worker_database(engine)
+    else:
+        Base.metadata.create_all(bind=engine)
+        yield
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(engine, db_schema):
+    """Run each test inside a transaction that is rolled back afterwards.
+
+    Commits made by the app or the test only release a savepoint, so no DDL
+    runs per test and every test still starts from empty tables. The session
+    is sync (psycopg2) because `get_db` and every route use a sync Session.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield db
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def _client():
+    """One TestClient for the whole run; per-test state lives in the overrides.
+
+    Used without ``with`` on purpose: the tests need none of the startup
+    or shutdown hooks. The OpenAPI schema is built here once (the route dependency trees are
+    already resolved at import) so no test pays for it lazily.
+    """
+    app.openapi()
+    client = TestClient(app)
+    # No test expects a redirect; surface one as-is rather than following it
+    client.follow_redirects = False
+    return client
+
+
+# Session handed out by the pinned `get_db` override; set by each client fixture.
+# A plain global rather than a ContextVar: TestClient runs the app in its
+# portal thread, which does not see context set in the test's thread.
+_current_db: Optional[Session] = None
+
+
+def _override_get_db() -> Optional[Session]:
+    return _current_db
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _pin_get_db_override():
+    """Install the `get_db` override once for the run instead of per test."""
+    app.dependency_overrides[get_db] = _override_get_db
+    # Background cache refreshes would open sessions on the app's own engine;
+    # without a session factory, stale hits recompute with the test's session
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for cache in (public_artist_filters_cache, public_model_cache, public_studio_cache):
+            monkeypatch.setattr(cache, "session_factory", None)
+        yield
+    app.dependency_overrides.pop(get_db, None)
+
+
+def _bind_app(db_session: Optional[Session]) -> None:
+    """Point `get_db` at this test's session and drop cached public responses."""
+    global _current_db
+    _current_db = db_session
+    # Cached public responses must not leak between tests
+    public_artist_filters_cache.clear()
+    public_model_cache.clear()
+    public_studio_cache.clear()
+
+
+@pytest.fixture(scope="function")
+def client(_client, db_session):
+    """Test client bound to this test's database session."""
+    _bind_app(db_session)
+    _client.cookies.clear()
+    yield _client
+    _bind_app(None)
+
+
+@pytest.fixture(scope="function")
+def api_client(_client):
+    """Test client for requests that never reach the database.
+
+    No connection or transaction is opened; a route that does use `get_db`
+    gets ``None`` and fails loudly, so the test should use `client` instead.
+    """
+    _bind_app(None)
+    _client.cookies.clear()
+    return _client
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run `@pytest.mark.anyio` tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="function")
+async def aclient(db_session):
+    """Async client that calls the ASGI app in-loop, without TestClient's portal thread."""
+    _bind_app(db_session)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+    _bind_app(None)
+
+
+@pytest.fixture(scope="function")
+def make_user(db_session):
+    """Factory that inserts a user and its role row directly, skipping the signup endpoint."""
+
+    def _make(
+        email: str,
+        username: str,
+        account_type: str = "artist",
+        password: str = "password123",
+    ) -> User:
+        user = User(
+            email=email,
+            password_hash=auth.hash_password(password),
+            username=username,
+            account_type=AccountType(account_type),
+            onboarding_completed=False,
+        )
+        db_session.add(user)
+        db_session.flush()
+        auth.create_role_for_user(db_session, user, account_type)
+        db_session.commit()
+        return user
+
+    return _make
+
+
+@pytest.fixture(scope="function")
+def login_as(make_user, db_session):
+    """Factory that creates a user and returns a session token, skipping signup/signin."""
+
+    def _login(email: str, username: str, account_type: str = "artist") -> str:
+        user = make_user(email, username, account_type)
+        return auth.create_session(db_session, user).id
+
+    return _login
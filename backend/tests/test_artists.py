@@ -1,74 +1,18 @@
 """Tests for artist profile and public artist endpoints."""
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from app.main import app
-from app.db.base import Base, get_db
-from app.config import settings
+
 from app.models.user import User, AccountType
 from app.models.artist import Artist
 from app.models.portfolio import PortfolioImage
 
 
-SQLALCHEMY_TEST_DATABASE_URL = settings.inkq_pg_url
-engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-@pytest.fixture(scope="function")
-def db_session():
-  """Create a fresh database for each test."""
-  Base.metadata.create_all(bind=engine)
-  db = TestingSessionLocal()
-  try:
-    yield db
-  finally:
-    db.close()
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture(scope="function")
-def client(db_session):
-  """Create a test client with database override."""
-
-  def override_get_db():
-    try:
-      yield db_session
-    finally:
-      pass
-
-  app.dependency_overrides[get_db] = override_get_db
-  yield TestClient(app)
-  app.dependency_overrides.clear()
-
-
-def signup_and_signin_artist(client: TestClient, email: str = "artist@example.com") -> str:
+def login_artist(login_as, email: str = "artist@example.com") -> str:
   """Helper to create an artist user and return access token."""
-  signup_resp = client.post(
-    "/api/v1/auth/signup",
-    json={
-      "email": email,
-      "password": "password123",
-      "username": "testartist",
-      "account_type": "artist",
-    },
-  )
-  assert signup_resp.status_code == 201
-
-  signin_resp = client.post(
-    "/api/v1/auth/signin",
-    json={"login": email, "password": "password123"},
-  )
-  assert signin_resp.status_code == 200
-  data = signin_resp.json()
-  return data["access_token"]
+  return login_as(email, "testartist", "artist")
 
 
-def test_get_me_artist_profile_initial(client, db_session):
+def test_get_me_artist_profile_initial(client, login_as):
   """GET /artists/me returns artist profile with steps for an artist user."""
-  token = signup_and_signin_artist(client)
+  token = login_artist(login_as)
 
   resp = client.get(
     "/api/v1/artists/me",
@@ -86,11 +30,14 @@ def test_get_me_artist_profile_initial(client, db_session):
   assert "portfolio_complete" in steps
   assert "wannado_complete" in steps
   assert 1 <= steps["first_incomplete_step"] <= 4
+  # Flags are only exposed nested under `steps`
+  assert "step_about_complete" not in data
+  assert "first_incomplete_step" not in data
 
 
-def test_put_me_updates_profile_and_onboarding(client, db_session):
+def test_put_me_updates_profile_and_onboarding(client, db_session, login_as):
   """PUT /artists/me updates artist metadata and onboarding_completed flag."""
-  token = signup_and_signin_artist(client, email="artist2@example.com")
+  token = login_artist(login_as, email="artist2@example.com")
 
   payload = {
     "about": "I love blackwork and geometric tattoos.",
@@ -175,9 +122,71 @@ def test_get_public_artist_profile(client, db_session):
   assert len(data["wannado"]) == 1
 
 
-def test_get_public_artist_not_found(client, db_session):
+def test_get_public_artist_portfolio_list(client, db_session):
+  """GET /public/artists/{slug}/portfolio lists only portfolio images, newest first."""
+  user = User(
+    email="portfolio@example.com",
+    password_hash="hash",
+    username="portfolioartist",
+    account_type=AccountType.ARTIST,
+    onboarding_completed=True,
+  )
+  db_session.add(user)
+  db_session.flush()
+  db_session.add(Artist(user_id=user.id, slug="portfolioartist"))
+  for name, kind in (("p1", "portfolio"), ("w1", "wannado"), ("p2", "portfolio")):
+    db_session.add(
+      PortfolioImage(
+        user_id=user.id,
+        kind=kind,
+        url=f"/media/{name}.webp",
+        width=800,
+        height=600,
+        mime_type="image/webp",
+        title="Not on the public list",
+      )
+    )
+    db_session.flush()
+  db_session.commit()
+
+  resp = client.get("/api/v1/public/artists/portfolioartist/portfolio")
+  assert resp.status_code == 200
+  items = resp.json()["items"]
+  assert [item["url"] for item in items] == ["/media/p2.webp", "/media/p1.webp"]
+  assert items[0]["kind"] == "portfolio"
+  assert items[0]["width"] == 800
+  # Null fields are omitted, as on the paginated list endpoints
+  assert "title" not in items[0]
+  assert isinstance(items[0]["created_at"], str)
+
+  resp_wannado = client.get("/api/v1/public/artists/portfolioartist/wannado")
+  assert resp_wannado.status_code == 200
+  assert len(resp_wannado.json()["items"]) == 1
+
+
+def test_get_public_artist_not_found(client):
   """GET /artists/{username} returns 404 for unknown artist."""
   resp = client.get("/api/v1/artists/unknown-artist")
   assert resp.status_code == 404
 
 
+def test_public_artist_filters_refresh_after_profile_update(client, login_as):
+  """GET /public/artists/filters lists onboarded cities and drops its cache on PUT /artists/me."""
+  token = login_artist(login_as)
+
+  resp = client.get("/api/v1/public/artists/filters")
+  assert resp.status_code == 200
+  data = resp.json()
+  assert data["cities"] == []
+  assert [style["id"] for style in data["styles"]][:2] == ["traditional", "neo_traditional"]
+
+  update_resp = client.put(
+    "/api/v1/artists/me",
+    headers={"Authorization": f"Bearer {token}"},
+    json={"city": "Berlin", "onboarding_completed": True},
+  )
+  assert update_resp.status_code == 200
+
+  resp = client.get("/api/v1/public/artists/filters")
+  assert resp.status_code == 200
+  assert resp.json()["cities"] == ["Berlin"]
@@ -1,150 +1,82 @@
 """Tests for authentication and signup flow."""
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.main import app
-from app.db.base import Base, get_db
+from sqlalchemy import exists, func, select
 from app.models.user import User, AccountType
 from app.models.artist import Artist
 from app.models.studio import Studio
 from app.models.model import Model
 from app.models.session import Session
-from app.config import settings
-
-# Create test database (for local dev we reuse the main DB URL)
-SQLALCHEMY_TEST_DATABASE_URL = settings.inkq_pg_url
-engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with database override."""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-    
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
-    app.dependency_overrides.clear()
 
 
-def test_signup_artist(client, db_session):
-    """Test signup as artist creates User + Artist in single transaction."""
-    response = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "artist@example.com",
-            "password": "password123",
-            "username": "testartist",
-            "account_type": "artist"
-        }
+def role_presence(db, user_id: int) -> tuple:
+    """Return (has_artist, has_studio, has_model) for a user in one query."""
+    return tuple(
+        db.execute(
+            select(
+                exists().where(Artist.user_id == user_id),
+                exists().where(Studio.user_id == user_id),
+                exists().where(Model.user_id == user_id),
+            )
+        ).one()
     )
-    
-    assert response.status_code == 201
-    data = response.json()
-    assert data["email"] == "artist@example.com"
-    assert data["username"] == "testartist"
-    assert data["account_type"] == "artist"
-    assert data["onboarding_completed"] is False
-    
-    # Verify User exists
-    user = db_session.query(User).filter(User.email == "artist@example.com").first()
-    assert user is not None
-    assert user.account_type == AccountType.ARTIST
-    
-    # Verify Artist role exists
-    artist = db_session.query(Artist).filter(Artist.user_id == user.id).first()
-    assert artist is not None
-    assert artist.user_id == user.id
-    
-    # Verify no other roles exist
-    studio = db_session.query(Studio).filter(Studio.user_id == user.id).first()
-    model = db_session.query(Model).filter(Model.user_id == user.id).first()
-    assert studio is None
-    assert model is None
 
 
-def test_signup_studio(client, db_session):
-    """Test signup as studio creates User + Studio in single transaction."""
+@pytest.mark.parametrize(
+    "account_type,role_model",
+    [("artist", Artist), ("studio", Studio), ("model", Model)],
+)
+def test_signup_role(client, db_session, account_type, role_model):
+    """Test signup creates User + the matching role in a single transaction."""
+    email = f"{account_type}@example.com"
     response = client.post(
         "/api/v1/auth/signup",
         json={
-            "email": "studio@example.com",
+            "email": email,
             "password": "password123",
-            "username": "teststudio",
-            "account_type": "studio"
+            "username": f"test{account_type}",
+            "account_type": account_type
         }
     )
     
     assert response.status_code == 201
     data = response.json()
-    assert data["account_type"] == "studio"
+    assert data["email"] == email
+    assert data["username"] == f"test{account_type}"
+    assert data["account_type"] == account_type
+    assert data["onboarding_completed"] is False
     
-    # Verify User and Studio exist
-    user = db_session.query(User).filter(User.email == "studio@example.com").first()
+    # Verify User exists
+    user = db_session.query(User).filter(User.email == email).first()
     assert user is not None
-    assert user.account_type == AccountType.STUDIO
-    
-    studio = db_session.query(Studio).filter(Studio.user_id == user.id).first()
-    assert studio is not None
+    assert user.account_type == AccountType(account_type)
     
-    # Verify no other roles exist
-    artist = db_session.query(Artist).filter(Artist.user_id == user.id).first()
-    model = db_session.query(Model).filter(Model.user_id == user.id).first()
-    assert artist is None
-    assert model is None
+    # Verify the matching role exists and no other roles do
+    expected = tuple(model is role_model for model in (Artist, Studio, Model))
+    assert role_presence(db_session, user.id) == expected
 
 
-def test_signup_model(client, db_session):
-    """Test signup as model creates User + Model in single transaction."""
+@pytest.mark.postgres
+def test_signup_commit_stays_inside_test_transaction(client, db_session):
+    """App commits only release a savepoint; other connections never see the rows."""
     response = client.post(
         "/api/v1/auth/signup",
         json={
-            "email": "model@example.com",
+            "email": "isolated@example.com",
             "password": "password123",
-            "username": "testmodel",
-            "account_type": "model"
+            "username": "isolated",
+            "account_type": "artist"
         }
     )
-    
+
     assert response.status_code == 201
-    data = response.json()
-    assert data["account_type"] == "model"
-    
-    # Verify User and Model exist
-    user = db_session.query(User).filter(User.email == "model@example.com").first()
-    assert user is not None
-    assert user.account_type == AccountType.MODEL
-    
-    model = db_session.query(Model).filter(Model.user_id == user.id).first()
-    assert model is not None
-    
-    # Verify no other roles exist
-    artist = db_session.query(Artist).filter(Artist.user_id == user.id).first()
-    studio = db_session.query(Studio).filter(Studio.user_id == user.id).first()
-    assert artist is None
-    assert studio is None
+    assert db_session.query(User).filter(User.email == "isolated@example.com").count() == 1
+    with db_session.get_bind().engine.connect() as other:
+        assert other.execute(select(func.count()).select_from(User)).scalar_one() == 0
 
 
-def test_signup_invalid_account_type(client, db_session):
+def test_signup_invalid_account_type(api_client):
     """Test signup with invalid account_type returns 400."""
-    response = client.post(
+    response = api_client.post(
         "/api/v1/auth/signup",
         json={
             "email": "invalid@example.com",
@@ -158,7 +90,7 @@ def test_signup_invalid_account_type(client, db_session):
     assert "Invalid account_type" in response.json()["detail"]
 
 
-def test_signup_duplicate_email(client, db_session):
+def test_signup_duplicate_email(client):
     """Test signup with duplicate email returns 400."""
     # First signup
     client.post(
@@ -186,7 +118,7 @@ def test_signup_duplicate_email(client, db_session):
     assert "already exists" in response.json()["detail"]
 
 
-def test_signup_duplicate_username(client, db_session):
+def test_signup_duplicate_username(client):
     """Test signup with duplicate username returns 400."""
     # First signup
     client.post(
@@ -231,24 +163,13 @@ def test_role_invariants(client, db_session):
     # Verify invariant: account_type = 'artist' => artist is not None
     user = db_session.query(User).filter(User.email == "invariant@example.com").first()
     assert user.account_type == AccountType.ARTIST
-    assert user.artist is not None
-    assert user.studio is None
-    assert user.model is None
+    assert role_presence(db_session, user.id) == (True, False, False)
 
 
-def test_signin_success(client, db_session):
+def test_signin_success(client, db_session, make_user):
     """Test successful signin creates session and returns token."""
-    # Create user via signup
-    signup_response = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "signin@example.com",
-            "password": "password123",
-            "username": "signinuser",
-            "account_type": "artist"
-        }
-    )
-    assert signup_response.status_code == 201
+    # Create user
+    make_user("signin@example.com", "signinuser", "artist")
     
     # Sign in
     signin_response = client.post(
@@ -268,23 +189,15 @@ def test_signin_success(client, db_session):
     
     # Verify session was created
     token = data["access_token"]
-    session = db_session.query(Session).filter(Session.id == token).first()
+    session = db_session.get(Session, token)
     assert session is not None
     assert session.user_id == data["user"]["id"]
 
 
-def test_signin_with_username(client, db_session):
+def test_signin_with_username(client, make_user):
     """Test signin with username instead of email."""
     # Create user
-    client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "username@example.com",
-            "password": "password123",
-            "username": "testusername",
-            "account_type": "studio"
-        }
-    )
+    make_user("username@example.com", "testusername", "studio")
     
     # Sign in with username
     response = client.post(
@@ -300,19 +213,27 @@ def test_signin_with_username(client, db_session):
     assert data["user"]["username"] == "testusername"
 
 
-def test_signin_wrong_password(client, db_session):
-    """Test signin with wrong password returns 401."""
-    # Create user
-    client.post(
-        "/api/v1/auth/signup",
+def test_signin_with_email_is_case_insensitive(client, make_user):
+    """Test signin matches the email regardless of case."""
+    make_user("casetest@example.com", "casetest", "model")
+    
+    response = client.post(
+        "/api/v1/auth/signin",
         json={
-            "email": "wrongpass@example.com",
-            "password": "password123",
-            "username": "wrongpass",
-            "account_type": "model"
+            "login": "CaseTest@Example.com",
+            "password": "password123"
         }
     )
     
+    assert response.status_code == 200
+    assert response.json()["user"]["username"] == "casetest"
+
+
+def test_signin_wrong_password(client, make_user):
+    """Test signin with wrong password returns 401."""
+    # Create user
+    make_user("wrongpass@example.com", "wrongpass", "model")
+    
     # Sign in with wrong password
     response = client.post(
         "/api/v1/auth/signin",
@@ -326,7 +247,7 @@ def test_signin_wrong_password(client, db_session):
     assert response.json()["detail"] == "invalid_credentials"
 
 
-def test_signin_invalid_user(client, db_session):
+def test_signin_invalid_user(client):
     """Test signin with non-existent user returns 401."""
     response = client.post(
         "/api/v1/auth/signin",
@@ -340,18 +261,10 @@ def test_signin_invalid_user(client, db_session):
     assert response.json()["detail"] == "invalid_credentials"
 
 
-def test_auth_me_success(client, db_session):
+def test_auth_me_success(client, db_session, make_user):
     """Test /auth/me returns user data for valid token."""
     # Create user and sign in
-    signup_response = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "me@example.com",
-            "password": "password123",
-            "username": "meuser",
-            "account_type": "artist"
-        }
-    )
+    make_user("me@example.com", "meuser", "artist")
     
     signin_response = client.post(
         "/api/v1/auth/signin",
@@ -375,11 +288,11 @@ def test_auth_me_success(client, db_session):
     assert data["account_type"] == "artist"
     
     # Verify last_seen_at was updated
-    session = db_session.query(Session).filter(Session.id == token).first()
+    session = db_session.get(Session, token)
     assert session.last_seen_at is not None
 
 
-def test_auth_me_invalid_token(client, db_session):
+def test_auth_me_invalid_token(client):
     """Test /auth/me with invalid token returns 401."""
     response = client.get(
         "/api/v1/auth/me",
@@ -389,25 +302,17 @@ def test_auth_me_invalid_token(client, db_session):
     assert response.status_code == 401
 
 
-def test_auth_me_no_token(client, db_session):
+def test_auth_me_no_token(api_client):
     """Test /auth/me without token returns 401."""
-    response = client.get("/api/v1/auth/me")
+    response = api_client.get("/api/v1/auth/me")
     
     assert response.status_code == 401
 
 
-def test_signout_success(client, db_session):
+def test_signout_success(client, db_session, make_user):
     """Test signout deletes session."""
     # Create user and sign in
-    client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "signout@example.com",
-            "password": "password123",
-            "username": "signoutuser",
-            "account_type": "studio"
-        }
-    )
+    make_user("signout@example.com", "signoutuser", "studio")
     
     signin_response = client.post(
         "/api/v1/auth/signin",
@@ -419,7 +324,7 @@ def test_signout_success(client, db_session):
     token = signin_response.json()["access_token"]
     
     # Verify session exists
-    session = db_session.query(Session).filter(Session.id == token).first()
+    session = db_session.get(Session, token)
     assert session is not None
     
     # Sign out
@@ -431,8 +336,7 @@ def test_signout_success(client, db_session):
     assert signout_response.status_code == 204
     
     # Verify session was deleted
-    db_session.expire_all()  # Refresh all objects
-    deleted_session = db_session.query(Session).filter(Session.id == token).first()
+    deleted_session = db_session.get(Session, token)
     assert deleted_session is None
     
     # Verify subsequent /auth/me calls fail
@@ -443,16 +347,24 @@ def test_signout_success(client, db_session):
     assert me_response.status_code == 401
 
 
-def test_signup_and_signin_with_long_password(client, db_session):
-    """User can signup and signin with a long password without 500 errors."""
-    long_password = "L" * 120
+@pytest.mark.parametrize(
+    "prefix,password",
+    [
+        ("longpass", "L" * 120),
+        # Multi-byte UTF-8 characters exceed 72 bytes easily (40 * 4 bytes)
+        ("longunicode", "🔒" * 40),
+    ],
+)
+def test_signup_and_signin_with_long_password(client, prefix, password):
+    """User can signup and signin with a long (or long UTF-8) password without 500 errors."""
+    email = f"{prefix}@example.com"
 
     signup_response = client.post(
         "/api/v1/auth/signup",
         json={
-            "email": "longpass@example.com",
-            "password": long_password,
-            "username": "longpassuser",
+            "email": email,
+            "password": password,
+            "username": f"{prefix}user",
             "account_type": "artist",
         },
     )
@@ -462,153 +374,49 @@ def test_signup_and_signin_with_long_password(client, db_session):
     signin_response = client.post(
         "/api/v1/auth/signin",
         json={
-            "login": "longpass@example.com",
-            "password": long_password,
+            "login": email,
+            "password": password,
         },
     )
 
     assert signin_response.status_code == 200
     data = signin_response.json()
     assert "access_token" in data
-    assert data["user"]["email"] == "longpass@example.com"
+    assert data["user"]["email"] == email
     # Ensure we never leak low-level bcrypt error messages
     assert "password cannot be longer than 72 bytes" not in signup_response.text
     assert "password cannot be longer than 72 bytes" not in signin_response.text
 
 
-def test_signup_and_signin_with_long_unicode_password(client, db_session):
-    """User can signup and signin with a long UTF-8 password without 500 errors."""
-    # Use characters that are multiple bytes in UTF-8 to exceed 72 bytes easily
-    long_unicode_password = "🔒" * 40  # 40 * 4 bytes = 160 bytes approximately
-
-    signup_response = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "longunicode@example.com",
-            "password": long_unicode_password,
-            "username": "longunicodeuser",
-            "account_type": "artist",
-        },
-    )
-
-    assert signup_response.status_code == 201
-
-    signin_response = client.post(
-        "/api/v1/auth/signin",
-        json={
-            "login": "longunicode@example.com",
-            "password": long_unicode_password,
-        },
-    )
+SIGNUP_PAYLOAD = {
+    "email": "passwordcheck@example.com",
+    "username": "passwordcheck",
+    "account_type": "artist",
+}
+SIGNIN_PAYLOAD = {"login": "passwordcheck@example.com"}
 
-    assert signin_response.status_code == 200
-    data = signin_response.json()
-    assert "access_token" in data
-    assert data["user"]["email"] == "longunicode@example.com"
-    # Ensure no raw bcrypt 72-byte error message is exposed
-    assert "password cannot be longer than 72 bytes" not in signup_response.text
-    assert "password cannot be longer than 72 bytes" not in signin_response.text
 
+@pytest.mark.parametrize(
+    "endpoint,payload",
+    [("/api/v1/auth/signup", SIGNUP_PAYLOAD), ("/api/v1/auth/signin", SIGNIN_PAYLOAD)],
+    ids=["signup", "signin"],
+)
+@pytest.mark.parametrize(
+    "password,error_type",
+    [("short", "string_too_short"), ("X" * 129, "string_too_long")],
+    ids=["too_short", "too_long"],
+)
+def test_rejects_password_length(api_client, endpoint, payload, password, error_type):
+    """Signup and signin reject out-of-range passwords at validation level.
 
-def test_signup_rejects_too_short_password(client, db_session):
-    """Signup should reject passwords shorter than the minimum."""
-    response = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "shortpass@example.com",
-            "password": "short",
-            "username": "shortuser",
-            "account_type": "artist",
-        },
-    )
+    Validation runs before any database access, so no user is needed.
+    """
+    response = api_client.post(endpoint, json={**payload, "password": password})
 
     assert response.status_code == 422
     detail = response.json()["detail"]
     # Pydantic v2 returns a list of error objects
     assert any(
-        "Password must be between" in err.get("msg", "")
-        for err in detail
-    )
-
-
-def test_signup_rejects_too_long_password(client, db_session):
-    """Signup should reject passwords longer than the maximum."""
-    long_password = "X" * 129
-
-    response = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "toolong@example.com",
-            "password": long_password,
-            "username": "toolonguser",
-            "account_type": "artist",
-        },
-    )
-
-    assert response.status_code == 422
-    detail = response.json()["detail"]
-    assert any(
-        "Password must be between" in err.get("msg", "")
-        for err in detail
-    )
-
-
-def test_signin_rejects_too_short_password(client, db_session):
-    """Signin should reject passwords that are too short at validation level."""
-    # First create a valid user
-    client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "signinshort@example.com",
-            "password": "validpassword",
-            "username": "signinshortuser",
-            "account_type": "artist",
-        },
-    )
-
-    response = client.post(
-        "/api/v1/auth/signin",
-        json={
-            "login": "signinshort@example.com",
-            "password": "short",
-        },
-    )
-
-    assert response.status_code == 422
-    detail = response.json()["detail"]
-    assert any(
-        "Password must be between" in err.get("msg", "")
-        for err in detail
-    )
-
-
-def test_signin_rejects_too_long_password(client, db_session):
-    """Signin should reject passwords that are too long at validation level."""
-    long_password = "P" * 120
-
-    # First create a valid user with a normal password
-    client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": "signinlong@example.com",
-            "password": "validpassword",
-            "username": "signinlonguser",
-            "account_type": "artist",
-        },
-    )
-
-    too_long_password = "P" * 129
-    response = client.post(
-        "/api/v1/auth/signin",
-        json={
-            "login": "signinlong@example.com",
-            "password": too_long_password,
-        },
-    )
-
-    assert response.status_code == 422
-    detail = response.json()["detail"]
-    assert any(
-        "Password must be between" in err.get("msg", "")
+        err["loc"][-1] == "password" and err["type"] == error_type
         for err in detail
     )
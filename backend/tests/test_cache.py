@@ -0,0 +1,50 @@
+"""Tests for the stale-while-revalidate public response cache."""
+
+import threading
+
+from app.utils.cache import StaleWhileRevalidateCache
+
+
+def test_stale_hit_refreshes_with_injected_session_factory():
+    """A stale hit is served as-is while a refresh runs on a session from the factory."""
+    request_session = object()
+    refreshed = threading.Event()
+    sessions = []
+
+    class FakeSession:
+        def close(self):
+            refreshed.set()
+
+    def session_factory():
+        session = FakeSession()
+        sessions.append(session)
+        return session
+
+    cache = StaleWhileRevalidateCache(
+        fresh_seconds=0, stale_seconds=60, session_factory=session_factory
+    )
+    calls = []
+
+    def compute(key, db):
+        calls.append(db)
+        return len(calls)
+
+    assert cache.get("key", request_session, compute) == 1
+    assert cache.get("key", request_session, compute) == 1
+    assert refreshed.wait(timeout=5)
+    assert calls == [request_session, sessions[0]]
+
+
+def test_stale_hit_without_session_factory_recomputes_inline():
+    """Without a session factory, stale entries are recomputed with the request's session."""
+    cache = StaleWhileRevalidateCache(fresh_seconds=0, stale_seconds=60)
+    request_session = object()
+    calls = []
+
+    def compute(key, db):
+        calls.append(db)
+        return len(calls)
+
+    assert cache.get("key", request_session, compute) == 1
+    assert cache.get("key", request_session, compute) == 2
+    assert calls == [request_session, request_session]
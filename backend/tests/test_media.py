@@ -1,111 +1,121 @@
 """Tests for media upload endpoints."""
+import asyncio
 import pytest
+from fastapi import FastAPI, HTTPException, UploadFile
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.main import app
-from app.db.base import Base, get_db
 from app.models.user import User, AccountType
 from app.models.session import Session as SessionModel
 from app.models.portfolio import PortfolioImage
-from app.config import settings
 from datetime import datetime, timedelta
-import secrets
+from types import SimpleNamespace
+from functools import lru_cache
+import itertools
 import io
 from PIL import Image
-from app.routes.auth import hash_password
+from app.routes import auth
+from app.routes import media as media_routes
+from app.utils.media import (
+    _center_crop_square,
+    MEDIA_CACHE_CONTROL,
+    MediaStaticFiles,
+    encode_image,
+    get_process_pool,
+    normalize_image,
+    pre_downscale,
+    process_avatar,
+    process_portfolio_batch,
+    process_upload_async,
+    read_upload_limited,
+    shutdown_process_pool,
+    write_media_file,
+)
 
-# Create test database (for local dev we reuse the main DB URL)
-SQLALCHEMY_TEST_DATABASE_URL = settings.inkq_pg_url
-engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with database override."""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-    
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
-    app.dependency_overrides.clear()
+# Deterministic, unique session tokens; tests need no CSPRNG strength
+_token_counter = itertools.count()
 
 
 @pytest.fixture
-def test_user(db_session):
-    """Create a test user."""
+def artist_login(db_session):
+    """Create an artist with a live session in one commit.
+
+    Returns a namespace with `user`, `token` and ready-made auth `headers`.
+    """
     user = User(
         email="test@example.com",
-        password_hash=hash_password("testpassword123"),
+        password_hash=auth.hash_password("testpassword123"),
         username="testuser",
         account_type=AccountType.ARTIST,
         onboarding_completed=False,
     )
     db_session.add(user)
+    db_session.flush()  # Assigns user.id for the session row
+    token = f"test-token-{next(_token_counter):08d}"
+    db_session.add(
+        SessionModel(
+            id=token,
+            user_id=user.id,
+            expires_at=datetime.utcnow() + timedelta(days=7),
+            last_seen_at=datetime.utcnow(),
+        )
+    )
     db_session.commit()
-    db_session.refresh(user)
-    return user
+    return SimpleNamespace(user=user, token=token, headers={"Authorization": f"Bearer {token}"})
+
+
+# Output size per upload kind, as produced by the real pipeline for the test JPEG
+FAKE_PROCESSED_SIZES = {"avatar": (400, 400), "banner": (1584, 396), "portfolio": (1200, 627)}
 
 
 @pytest.fixture
-def test_session(db_session, test_user):
-    """Create a test session."""
-    token = secrets.token_urlsafe(32)
-    session = SessionModel(
-        id=token,
-        user_id=test_user.id,
-        expires_at=datetime.utcnow() + timedelta(days=7),
-        last_seen_at=datetime.utcnow(),
-    )
-    db_session.add(session)
-    db_session.commit()
-    return token
+def fake_image_processing(monkeypatch):
+    """Skip Pillow in upload routes; the pipeline itself is covered separately."""
 
+    def fake_result(kind):
+        width, height = FAKE_PROCESSED_SIZES[kind]
+        return f"RIFF-fake-{kind}".encode(), width, height
 
-def create_test_image() -> io.BytesIO:
-    """Create a test image in memory."""
+    async def process_upload_async(kind, image_bytes):
+        return fake_result(kind)
+
+    async def process_portfolio_batch(images_bytes):
+        return [fake_result("portfolio") for _ in images_bytes]
+
+    monkeypatch.setattr(media_routes, "process_upload_async", process_upload_async)
+    monkeypatch.setattr(media_routes, "process_portfolio_batch", process_portfolio_batch)
+
+
+@lru_cache(maxsize=1)
+def _test_jpeg_bytes() -> bytes:
+    """Encode the test JPEG once per run."""
     img = Image.new('RGB', (800, 600), color='red')
     img_bytes = io.BytesIO()
     img.save(img_bytes, format='JPEG')
-    img_bytes.seek(0)
-    return img_bytes
+    return img_bytes.getvalue()
 
 
-def test_upload_avatar_invalid_file_type(client, test_session):
+def create_test_image() -> io.BytesIO:
+    """Create a test image in memory."""
+    return io.BytesIO(_test_jpeg_bytes())
+
+
+def test_upload_avatar_invalid_file_type(client, artist_login):
     """Test uploading avatar with invalid file type."""
     # Create a text file
     files = {"file": ("test.txt", io.BytesIO(b"not an image"), "text/plain")}
-    headers = {"Authorization": f"Bearer {test_session}"}
     
-    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=headers)
+    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=artist_login.headers)
     
     assert response.status_code == 415
     assert "Unsupported file type" in response.json()["detail"]
 
 
-def test_upload_avatar_success(client, db_session, test_user, test_session):
-    """Test successful avatar upload."""
+def test_upload_avatar_success(client, artist_login):
+    """Test successful avatar upload (end to end through the real image pipeline)."""
     img_bytes = create_test_image()
     files = {"file": ("test.jpg", img_bytes, "image/jpeg")}
-    headers = {"Authorization": f"Bearer {test_session}"}
     
-    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=headers)
+    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=artist_login.headers)
     
     assert response.status_code == 200
     data = response.json()
@@ -113,10 +123,9 @@ def test_upload_avatar_success(client, db_session, test_user, test_session):
     assert data["width"] == 400
     assert data["height"] == 400
     
-    # Verify user record was updated
-    db_session.refresh(test_user)
-    assert test_user.avatar_url is not None
-    assert test_user.avatar_url == data["url"]
+    # Verify user record was updated (the route updated this same identity-mapped object)
+    assert artist_login.user.avatar_url is not None
+    assert artist_login.user.avatar_url == data["url"]
 
 
 def test_upload_avatar_unauthorized(client):
@@ -129,28 +138,26 @@ def test_upload_avatar_unauthorized(client):
     assert response.status_code == 401
 
 
-def test_upload_avatar_wrong_role(client, db_session, test_user, test_session):
+def test_upload_avatar_wrong_role(client, db_session, artist_login):
     """Test uploading avatar with wrong account type."""
     # Change user to studio
-    test_user.account_type = AccountType.STUDIO
+    artist_login.user.account_type = AccountType.STUDIO
     db_session.commit()
     
     img_bytes = create_test_image()
     files = {"file": ("test.jpg", img_bytes, "image/jpeg")}
-    headers = {"Authorization": f"Bearer {test_session}"}
     
-    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=headers)
+    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=artist_login.headers)
     
     assert response.status_code == 403
 
 
-def test_upload_banner_success(client, db_session, test_user, test_session):
+def test_upload_banner_success(client, artist_login, fake_image_processing):
     """Test successful banner upload."""
     img_bytes = create_test_image()
     files = {"file": ("test.jpg", img_bytes, "image/jpeg")}
-    headers = {"Authorization": f"Bearer {test_session}"}
     
-    response = client.post("/api/v1/media/artists/me/banner", files=files, headers=headers)
+    response = client.post("/api/v1/media/artists/me/banner", files=files, headers=artist_login.headers)
     
     assert response.status_code == 200
     data = response.json()
@@ -158,13 +165,12 @@ def test_upload_banner_success(client, db_session, test_user, test_session):
     assert data["width"] == 1584
     assert data["height"] == 396
     
-    # Verify user record was updated
-    db_session.refresh(test_user)
-    assert test_user.banner_url is not None
-    assert test_user.banner_url == data["url"]
+    # Verify user record was updated (the route updated this same identity-mapped object)
+    assert artist_login.user.banner_url is not None
+    assert artist_login.user.banner_url == data["url"]
 
 
-def test_upload_portfolio_success(client, db_session, test_user, test_session):
+def test_upload_portfolio_success(client, db_session, artist_login, fake_image_processing):
     """Test successful portfolio upload."""
     img1_bytes = create_test_image()
     img2_bytes = create_test_image()
@@ -174,13 +180,12 @@ def test_upload_portfolio_success(client, db_session, test_user, test_session):
         ("files", ("test2.jpg", img2_bytes, "image/jpeg")),
     ]
     data = {"kind": "portfolio"}
-    headers = {"Authorization": f"Bearer {test_session}"}
     
     response = client.post(
         "/api/v1/media/artists/me/portfolio",
         files=files,
         data=data,
-        headers=headers
+        headers=artist_login.headers
     )
     
     assert response.status_code == 200
@@ -189,22 +194,45 @@ def test_upload_portfolio_success(client, db_session, test_user, test_session):
     assert len(data["items"]) == 2
     
     # Verify portfolio images were created
-    portfolio_images = db_session.query(PortfolioImage).filter(PortfolioImage.user_id == test_user.id).all()
+    portfolio_images = db_session.query(PortfolioImage).filter(PortfolioImage.user_id == artist_login.user.id).all()
     assert len(portfolio_images) == 2
 
 
-def test_list_portfolio(client, db_session, test_user, test_session):
+def test_process_portfolio_batch_keeps_order_and_isolates_failures():
+    """A broken image in a batch comes back as an exception without failing the rest."""
+    valid = create_test_image().getvalue()
+    results = asyncio.run(process_portfolio_batch([valid, b"\xff\xd8\xffnot-a-jpeg", valid]))
+
+    assert len(results) == 3
+    assert isinstance(results[1], Exception)
+    assert results[0] == results[2]
+    encoded, width, height = results[0]
+    assert encoded[:4] == b"RIFF"
+    assert width > 0 and height > 0
+
+
+
+def test_process_pool_recreated_after_shutdown():
+    """Uploads keep working after a shutdown hook stopped the pool (e.g. a reload)."""
+    pool = get_process_pool()
+    shutdown_process_pool()
+
+    assert get_process_pool() is not pool
+    encoded, width, height = asyncio.run(process_upload_async("avatar", create_test_image().getvalue()))
+    assert encoded[:4] == b"RIFF"
+    assert (width, height) == (400, 400)
+
+def test_list_portfolio(client, artist_login):
     """Test listing portfolio images."""
     # First upload some images
     img_bytes = create_test_image()
     files = [("files", ("test.jpg", img_bytes, "image/jpeg"))]
     data = {"kind": "portfolio"}
-    headers = {"Authorization": f"Bearer {test_session}"}
     
-    client.post("/api/v1/media/artists/me/portfolio", files=files, data=data, headers=headers)
+    client.post("/api/v1/media/artists/me/portfolio", files=files, data=data, headers=artist_login.headers)
     
     # Now list them
-    response = client.get("/api/v1/media/artists/me/portfolio", headers=headers)
+    response = client.get("/api/v1/media/artists/me/portfolio", headers=artist_login.headers)
     
     assert response.status_code == 200
     data = response.json()
@@ -212,11 +240,11 @@ def test_list_portfolio(client, db_session, test_user, test_session):
     assert len(data["items"]) >= 1
 
 
-def test_delete_portfolio_image(client, db_session, test_user, test_session):
+def test_delete_portfolio_image(client, db_session, artist_login):
     """Test deleting a portfolio image."""
     # Create a portfolio image
     portfolio_image = PortfolioImage(
-        user_id=test_user.id,
+        user_id=artist_login.user.id,
         kind="portfolio",
         url="/media/test.jpg",
         width=1200,
@@ -225,13 +253,11 @@ def test_delete_portfolio_image(client, db_session, test_user, test_session):
     )
     db_session.add(portfolio_image)
     db_session.commit()
-    db_session.refresh(portfolio_image)
     
     # Delete it
-    headers = {"Authorization": f"Bearer {test_session}"}
     response = client.delete(
         f"/api/v1/media/portfolio/{portfolio_image.id}",
-        headers=headers
+        headers=artist_login.headers
     )
     
     assert response.status_code == 204
@@ -239,3 +265,125 @@ def test_delete_portfolio_image(client, db_session, test_user, test_session):
     # Verify it was deleted
     deleted = db_session.query(PortfolioImage).filter(PortfolioImage.id == portfolio_image.id).first()
     assert deleted is None
+
+
+def test_pre_downscale_decodes_large_jpeg_at_reduced_scale():
+    """pre_downscale shrinks JPEG decoding but keeps >= 2x the target in the crop."""
+    img = Image.new('RGB', (4000, 3000), color='red')
+    buf = io.BytesIO()
+    img.save(buf, format='JPEG')
+
+    jpeg = Image.open(io.BytesIO(buf.getvalue()))
+    pre_downscale(jpeg, 400, 400)
+    assert jpeg.size == (2000, 1500)
+
+    processed, width, height = process_avatar(Image.open(io.BytesIO(buf.getvalue())))
+    assert processed.size == (width, height) == (400, 400)
+
+    png_buf = io.BytesIO()
+    img.save(png_buf, format='PNG')
+    png = Image.open(io.BytesIO(png_buf.getvalue()))
+    pre_downscale(png, 400, 400)
+    assert png.size == (4000, 3000)
+
+
+def test_upload_avatar_rejects_non_image_content(client, artist_login):
+    """Declared image type with non-image bytes is rejected by the signature check."""
+    files = {"file": ("fake.jpg", io.BytesIO(b"not really a jpeg"), "image/jpeg")}
+
+    response = client.post("/api/v1/media/artists/me/avatar", files=files, headers=artist_login.headers)
+
+    assert response.status_code == 415
+    assert "Unsupported file type" in response.json()["detail"]
+
+
+def test_read_upload_limited_stops_past_max_bytes():
+    """read_upload_limited raises 413 once the running size passes the limit."""
+    payload = create_test_image().getvalue()
+
+    upload = UploadFile(file=io.BytesIO(payload), filename="test.jpg")
+    assert asyncio.run(read_upload_limited(upload, max_bytes=len(payload))) == payload
+
+    upload = UploadFile(file=io.BytesIO(payload), filename="test.jpg")
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(read_upload_limited(upload, max_bytes=len(payload) - 1))
+    assert exc_info.value.status_code == 413
+
+
+@pytest.mark.parametrize("size", [(800, 600), (600, 800), (333, 333), (401, 1000)])
+def test_center_crop_square_matches_normalize_image(size):
+    """The integer avatar crop gives exactly the generic center-crop result."""
+    image = Image.effect_noise(size, 64).convert("RGB")
+
+    fast = _center_crop_square(image, 400)
+
+    assert fast.size == (400, 400)
+    assert fast.tobytes() == normalize_image(image, 400, 400, crop_mode="center").tobytes()
+
+
+def test_normalize_image_fit_mode_pads_without_mutating_input():
+    """Fit mode scales down to fit, pads to the target and leaves the input intact."""
+    img = Image.new('RGB', (1000, 500), color='red')
+
+    fitted = normalize_image(img, 400, 400, crop_mode="fit")
+
+    assert fitted.size == (400, 400)
+    assert img.size == (1000, 500)
+    # Scaled content is 400x200, centered between white bands
+    assert fitted.getpixel((200, 200)) == (255, 0, 0)
+    assert fitted.getpixel((200, 50)) == (255, 255, 255)
+
+
+def test_encode_image_keeps_alpha_for_webp_and_flattens_jpeg():
+    """WebP encodes RGBA directly; JPEG output is flattened to RGB."""
+    image = Image.new("RGBA", (16, 16), (0, 0, 255, 0))
+
+    assert Image.open(io.BytesIO(encode_image(image, format="WEBP"))).mode == "RGBA"
+    flattened = Image.open(io.BytesIO(encode_image(image, format="JPEG")))
+    assert flattened.mode == "RGB"
+    assert flattened.getpixel((8, 8))[0] > 240  # transparent pixels become white
+    assert image.mode == "RGBA"
+
+
+def test_media_static_files_accel_redirect(tmp_path):
+    """With a prefix set, media responses delegate the file transfer to the proxy."""
+    (tmp_path / "avatars").mkdir()
+    (tmp_path / "avatars" / "a.webp").write_bytes(b"webp-bytes")
+    media_app = FastAPI()
+    media_app.mount("/media", MediaStaticFiles(directory=str(tmp_path), accel_redirect_prefix="/_media/"))
+    media_client = TestClient(media_app)
+
+    response = media_client.get("/media/avatars/a.webp")
+
+    assert response.status_code == 200
+    assert response.headers["x-accel-redirect"] == "/_media/avatars/a.webp"
+    assert response.headers["cache-control"] == MEDIA_CACHE_CONTROL
+    assert response.content == b""
+    assert media_client.get("/media/avatars/missing.webp").status_code == 404
+
+
+def test_write_media_file_names_files_by_content(tmp_path):
+    """Equal bytes share one file per user; different bytes or users get different names."""
+    first = write_media_file(tmp_path, b"same-bytes", 1, "avatar")
+    second = write_media_file(tmp_path, b"same-bytes", 1, "avatar")
+    other = write_media_file(tmp_path, b"other-bytes", 1, "avatar")
+    other_user = write_media_file(tmp_path, b"same-bytes", 2, "avatar")
+
+    assert first == second
+    assert len({first, other, other_user}) == 3
+    assert first.name.startswith("avatar_user_1_") and first.suffix == ".webp"
+    assert first.read_bytes() == b"same-bytes"
+    # The temporary file is renamed into place, not left behind
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        path.name for path in (first, other, other_user)
+    )
+
+
+def test_write_media_file_recreates_missing_directory(tmp_path):
+    """A media directory removed after startup is created again on the next write."""
+    directory = tmp_path / "avatars"
+
+    written = write_media_file(directory, b"bytes", 1, "avatar")
+
+    assert written.parent == directory
+    assert written.read_bytes() == b"bytes"
@@ -0,0 +1,111 @@
+"""Tests for model profile and public model endpoints."""
+
+from app.models.model import Model
+from app.models.user import AccountType, User
+
+
+def login_model(login_as, email: str = "model@example.com", username: str = "testmodel") -> str:
+    """Helper to create a model user and return access token."""
+    return login_as(email, username, "model")
+
+
+def test_public_model_page_reflects_profile_update(client, login_as):
+    """PUT /models/me drops the cached public page, so the next read is fresh."""
+    token = login_model(login_as)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.put(
+        "/api/v1/models/me",
+        headers=headers,
+        json={"city": "Berlin", "onboarding_completed": True},
+    )
+    assert resp.status_code == 200
+    resp = client.get("/api/v1/public/models/testmodel")
+    assert resp.status_code == 200
+    assert resp.json()["city"] == "Berlin"
+
+    resp = client.put("/api/v1/models/me", headers=headers, json={"city": "Munich"})
+    assert resp.status_code == 200
+    resp = client.get("/api/v1/public/models/testmodel")
+    assert resp.json()["city"] == "Munich"
+
+
+def make_public_model(db_session, username: str, city: str, onboarded: bool = True, **fields) -> Model:
+    """Insert a model user and its profile directly."""
+    user = User(
+        email=f"{username}@example.com",
+        password_hash="hash",
+        username=username,
+        account_type=AccountType.MODEL,
+        onboarding_completed=onboarded,
+    )
+    model = Model(user=user, city=city, **fields)
+    db_session.add_all([user, model])
+    db_session.flush()
+    return model
+
+
+def test_get_public_model_by_slug_and_username(client, db_session):
+    """GET /public/models/{slug} resolves both the slug and the username."""
+    make_public_model(db_session, "slugmodel", "Paris", slug="paris-model", display_name="Paris Model")
+
+    for identifier in ("paris-model", "slugmodel"):
+        resp = client.get(f"/api/v1/public/models/{identifier}")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["username"] == "slugmodel"
+        assert data["display_name"] == "Paris Model"
+        assert data["gallery"] == []
+
+
+def test_get_public_model_hides_unfinished_onboarding(client, db_session):
+    """GET /public/models/{slug} returns 404 until onboarding is completed."""
+    make_public_model(db_session, "draftmodel", "Paris", onboarded=False)
+
+    assert client.get("/api/v1/public/models/draftmodel").status_code == 404
+    assert client.get("/api/v1/public/models/unknown-model").status_code == 404
+
+
+def test_public_model_lookups_do_not_share_bound_values(client, db_session, login_as):
+    """The cached lambda statements bind each request's own slug and user id."""
+    make_public_model(db_session, "firstmodel", "Paris")
+    make_public_model(db_session, "secondmodel", "Berlin")
+
+    # Same statement shape, different parameters: each answer must match its key
+    assert client.get("/api/v1/public/models/firstmodel").json()["city"] == "Paris"
+    assert client.get("/api/v1/public/models/secondmodel").json()["city"] == "Berlin"
+    assert client.get("/api/v1/public/models/firstmodel").json()["username"] == "firstmodel"
+
+    first_token = login_model(login_as, "me-first@example.com", "mefirst")
+    second_token = login_model(login_as, "me-second@example.com", "mesecond")
+    for token, username in ((first_token, "mefirst"), (second_token, "mesecond"), (first_token, "mefirst")):
+        resp = client.get("/api/v1/models/me", headers={"Authorization": f"Bearer {token}"})
+        assert resp.status_code == 200
+        assert resp.json()["username"] == username
+
+
+def test_list_public_models_filters_and_paginates(client, db_session):
+    """GET /public/models lists onboarded models, newest first, with a city filter."""
+    make_public_model(db_session, "listparis", "Paris", styles=["editorial"])
+    make_public_model(db_session, "listberlin", "Berlin")
+    make_public_model(db_session, "listdraft", "Paris", onboarded=False)
+
+    resp = client.get("/api/v1/public/models")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 2
+    assert {item["username"] for item in data["items"]} == {"listparis", "listberlin"}
+    # Slug falls back to the username when the profile has none
+    assert {item["slug"] for item in data["items"]} == {"listparis", "listberlin"}
+
+    resp = client.get("/api/v1/public/models", params={"city": " PARIS "})
+    data = resp.json()
+    assert data["total"] == 1
+    assert data["items"][0]["username"] == "listparis"
+    assert data["items"][0]["styles"] == ["editorial"]
+
+    resp = client.get("/api/v1/public/models", params={"limit": 1, "offset": 1})
+    data = resp.json()
+    assert data["total"] == 2
+    assert len(data["items"]) == 1
+    assert (data["limit"], data["offset"]) == (1, 1)
@@ -1,77 +1,41 @@
 """Tests for studio profile, residents, booking and public studio endpoints."""
 
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event, insert, select
 
-from app.main import app
-from app.db.base import Base, get_db
-from app.config import settings
 from app.models.user import User, AccountType
 from app.models.studio import Studio
 from app.models.artist import Artist
 from app.models.portfolio import PortfolioImage
 from app.models.artist_studio_resident import ArtistStudioResident
-
-
-SQLALCHEMY_TEST_DATABASE_URL = settings.inkq_pg_url
-engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with database override."""
-
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
-    app.dependency_overrides.clear()
-
-
-def signup_and_signin_studio(client: TestClient, email: str = "studio@example.com") -> str:
+from app.models.booking_request import BookingRequest
+from app.routes.studios import public_studio_cache
+
+
+PUT_ME_PAYLOAD = {
+    "name": "InkQ Studio",
+    "about": "Modern tattoo studio in the city center.",
+    "city": "Berlin",
+    "address": "Main street 1",
+    "instagram": "@inkq_studio",
+    "telegram": "@inkq_studio_tg",
+    "vk": "https://vk.com/inkq",
+    "session_price_label": "from 80€/session",
+    "onboarding_completed": True,
+}
+# Encoded once at import; sent as the raw request body
+PUT_ME_BODY = orjson.dumps(PUT_ME_PAYLOAD)
+
+
+def login_studio(login_as, email: str = "studio@example.com") -> str:
     """Helper to create a studio user and return access token."""
-    signup_resp = client.post(
-        "/api/v1/auth/signup",
-        json={
-            "email": email,
-            "password": "password123",
-            "username": "teststudio",
-            "account_type": "studio",
-        },
-    )
-    assert signup_resp.status_code == 201
-
-    signin_resp = client.post(
-        "/api/v1/auth/signin",
-        json={"login": email, "password": "password123"},
-    )
-    assert signin_resp.status_code == 200
-    data = signin_resp.json()
-    return data["access_token"]
+    return login_as(email, "teststudio", "studio")
 
 
-def test_get_me_studio_profile_initial(client, db_session):
+def test_get_me_studio_profile_initial(client, login_as):
     """GET /studios/me returns studio profile for a studio user."""
-    token = signup_and_signin_studio(client)
+    token = login_studio(login_as)
 
     resp = client.get(
         "/api/v1/studios/me",
@@ -85,26 +49,41 @@ def test_get_me_studio_profile_initial(client, db_session):
     assert data["onboarding_completed"] is False
 
 
-def test_put_me_updates_studio_profile_and_onboarding(client, db_session):
+def test_get_me_existing_studio_does_not_write_studio_row(client, db_session, login_as):
+    """GET /studios/me only reads the studio row once it exists."""
+    token = login_studio(login_as, email="studio-readonly@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/studios/me", headers=headers).status_code == 200
+
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        resp = client.get("/api/v1/studios/me", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert resp.status_code == 200
+    assert not [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith(("INSERT INTO STUDIOS", "UPDATE STUDIOS"))
+    ]
+
+
+def test_put_me_updates_studio_profile_and_onboarding(client, db_session, login_as):
     """PUT /studios/me updates studio metadata and onboarding_completed flag."""
-    token = signup_and_signin_studio(client, email="studio2@example.com")
+    token = login_studio(login_as, email="studio2@example.com")
 
-    payload = {
-        "name": "InkQ Studio",
-        "about": "Modern tattoo studio in the city center.",
-        "city": "Berlin",
-        "address": "Main street 1",
-        "instagram": "@inkq_studio",
-        "telegram": "@inkq_studio_tg",
-        "vk": "https://vk.com/inkq",
-        "session_price_label": "from 80€/session",
-        "onboarding_completed": True,
-    }
+    payload = PUT_ME_PAYLOAD
 
     resp = client.put(
         "/api/v1/studios/me",
-        headers={"Authorization": f"Bearer {token}"},
-        json=payload,
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        content=PUT_ME_BODY,
     )
 
     assert resp.status_code == 200
@@ -120,89 +99,222 @@ def test_put_me_updates_studio_profile_and_onboarding(client, db_session):
     assert data["onboarding_completed"] is True
 
     # Verify DB state
-    user = db_session.query(User).filter(User.email == "studio2@example.com").first()
-    assert user is not None
-    studio = db_session.query(Studio).filter(Studio.user_id == user.id).first()
-    assert studio is not None
+    user, studio = db_session.execute(
+        select(User, Studio)
+        .join(Studio, Studio.user_id == User.id)
+        .where(User.email == "studio2@example.com")
+    ).one()
     assert studio.onboarding_completed is True
     assert studio.city == "Berlin"
 
 
-def test_public_studio_endpoint_with_gallery_and_team(client, db_session):
+@pytest.mark.anyio
+@pytest.mark.postgres
+async def test_public_studio_endpoint_with_gallery_and_team(aclient, db_session):
     """GET /public/studios/{slug} returns studio info, gallery and team."""
-    # Create studio user and studio
+    # Read-only fixture rows: Core-level bulk inserts, no ORM objects to track
+    studio_user_id, artist_user_id, second_user_id = db_session.scalars(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [
+            {
+                "email": "studio-public@example.com",
+                "password_hash": "hash",
+                "username": "publicstudio",
+                "account_type": AccountType.STUDIO,
+                "onboarding_completed": True,
+            },
+            {
+                "email": "artist-public@example.com",
+                "password_hash": "hash",
+                "username": "artistresident",
+                "account_type": AccountType.ARTIST,
+                "onboarding_completed": True,
+            },
+            {
+                "email": "artist-public-2@example.com",
+                "password_hash": "hash",
+                "username": "artistresident2",
+                "account_type": AccountType.ARTIST,
+                "onboarding_completed": True,
+            },
+        ],
+    ).all()
+    studio_id = db_session.scalar(
+        insert(Studio).returning(Studio.id),
+        {
+            "user_id": studio_user_id,
+            "name": "Public Studio",
+            "city": "Paris",
+            "address": "Studio street 5",
+            "instagram": "@public_studio",
+        },
+    )
+
+    # Gallery image
+    db_session.execute(
+        insert(PortfolioImage),
+        [
+            {
+                "user_id": studio_user_id,
+                "kind": "portfolio",
+                "url": "/media/studio1.webp",
+                "width": 1200,
+                "height": 800,
+                "mime_type": "image/webp",
+            }
+        ],
+    )
+
+    # Two accepted resident artists with overlapping styles
+    artist_ids = db_session.scalars(
+        insert(Artist).returning(Artist.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": artist_user_id,
+                "display_name": "Resident Artist",
+                "styles": ["blackwork"],
+                "city": "Paris",
+            },
+            {"user_id": second_user_id, "styles": ["realism", "blackwork"]},
+        ],
+    ).all()
+    db_session.execute(
+        insert(ArtistStudioResident),
+        [{"studio_id": studio_id, "artist_id": artist_id, "status": "accepted"} for artist_id in artist_ids],
+    )
+
+    resp = await aclient.get("/api/v1/public/studios/publicstudio")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["studio"]["name"] == "Public Studio"
+    assert data["studio"]["city"] == "Paris"
+    assert len(data["gallery"]) == 1
+    assert len(data["team"]) == 2
+    assert data["aggregated_styles"] == ["blackwork", "realism"]
+
+
+@pytest.mark.anyio
+@pytest.mark.postgres
+async def test_public_studio_served_from_cache(aclient, db_session):
+    """GET /public/studios/{slug} serves a cached page until the entry is dropped."""
     user = User(
-        email="studio-public@example.com",
+        email="studio-cached@example.com",
         password_hash="hash",
-        username="publicstudio",
+        username="cachedstudio",
         account_type=AccountType.STUDIO,
         onboarding_completed=True,
     )
     db_session.add(user)
     db_session.flush()
-
-    studio = Studio(
-        user_id=user.id,
-        name="Public Studio",
-        city="Paris",
-        address="Studio street 5",
-        instagram="@public_studio",
-    )
+    studio = Studio(user_id=user.id, name="Cached Studio", city="Paris")
     db_session.add(studio)
     db_session.flush()
 
-    # Add gallery image
-    img = PortfolioImage(
-        user_id=user.id,
-        kind="portfolio",
-        url="/media/studio1.webp",
-        width=1200,
-        height=800,
-        mime_type="image/webp",
-    )
-    db_session.add(img)
+    resp = await aclient.get("/api/v1/public/studios/cachedstudio")
+    assert resp.status_code == 200
+    assert resp.json()["studio"]["city"] == "Paris"
 
-    # Create accepted resident artist
-    artist_user = User(
-        email="artist-public@example.com",
+    studio.city = "Lyon"
+    db_session.flush()
+
+    resp = await aclient.get("/api/v1/public/studios/cachedstudio")
+    assert resp.json()["studio"]["city"] == "Paris"
+
+    public_studio_cache.invalidate("cachedstudio")
+    resp = await aclient.get("/api/v1/public/studios/cachedstudio")
+    assert resp.json()["studio"]["city"] == "Lyon"
+
+
+@pytest.mark.anyio
+@pytest.mark.postgres
+async def test_public_studio_warm_hit_runs_no_sql(aclient, db_session):
+    """A second GET /public/studios/{slug} is answered from the cache without SQL."""
+    user = User(
+        email="studio-warm@example.com",
         password_hash="hash",
-        username="artistresident",
-        account_type=AccountType.ARTIST,
+        username="warmstudio",
+        account_type=AccountType.STUDIO,
         onboarding_completed=True,
     )
-    db_session.add(artist_user)
+    db_session.add_all([user, Studio(user=user, name="Warm Studio", city="Paris")])
     db_session.flush()
 
-    artist = Artist(
-        user_id=artist_user.id,
-        display_name="Resident Artist",
-        styles=["blackwork"],
-        city="Paris",
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        cold = await aclient.get("/api/v1/public/studios/warmstudio")
+        cold_statements = len(statements)
+        warm = await aclient.get("/api/v1/public/studios/warmstudio")
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert cold.status_code == warm.status_code == 200
+    assert warm.json() == cold.json()
+    assert cold_statements > 0
+    assert len(statements) == cold_statements
+
+
+@pytest.mark.anyio
+@pytest.mark.postgres
+async def test_public_studio_page_build_is_read_only(aclient, db_session):
+    """A legacy studio flag is not promoted by the public page; the user flag decides visibility."""
+    user = User(
+        email="studio-legacy@example.com",
+        password_hash="hash",
+        username="legacystudio",
+        account_type=AccountType.STUDIO,
+        onboarding_completed=True,
     )
-    db_session.add(artist)
+    db_session.add_all([user, Studio(user=user, name="Legacy Studio", onboarding_completed=False)])
     db_session.flush()
 
-    residency = ArtistStudioResident(
-        studio_id=studio.id,
-        artist_id=artist.id,
-        status="accepted",
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        resp = await aclient.get("/api/v1/public/studios/legacystudio")
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert resp.status_code == 200
+    assert resp.json()["studio"]["name"] == "Legacy Studio"
+    assert not [s for s in statements if s.lstrip().upper().startswith(("UPDATE", "INSERT"))]
+
+
+@pytest.mark.postgres
+def test_public_studio_page_reflects_profile_update(client, login_as):
+    """PUT /studios/me drops the cached public page, so the next read is fresh."""
+    token = login_studio(login_as, email="studio-edit@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.put(
+        "/api/v1/studios/me",
+        headers=headers,
+        json={"city": "Berlin", "onboarding_completed": True},
     )
-    db_session.add(residency)
-    db_session.commit()
+    assert resp.status_code == 200
+    resp = client.get("/api/v1/public/studios/teststudio")
+    assert resp.status_code == 200
+    assert resp.json()["studio"]["city"] == "Berlin"
 
-    resp = client.get("/api/v1/public/studios/publicstudio")
+    resp = client.put("/api/v1/studios/me", headers=headers, json={"city": "Munich"})
     assert resp.status_code == 200
-    data = resp.json()
-    assert data["studio"]["name"] == "Public Studio"
-    assert data["studio"]["city"] == "Paris"
-    assert len(data["gallery"]) == 1
-    assert len(data["team"]) == 1
-    assert data["aggregated_styles"] == ["blackwork"]
+    resp = client.get("/api/v1/public/studios/teststudio")
+    assert resp.json()["studio"]["city"] == "Munich"
 
 
-def test_public_studio_booking_general_and_artist_specific(client, db_session):
-    """POST /public/studios/{slug}/booking works for general and artist_specific."""
-    # Create studio and accepted artist resident similar to previous test
+@pytest.fixture
+def booking_studio(db_session):
+    """Studio with one accepted resident artist; returns ``(studio, artist)``."""
     user = User(
         email="studio-booking@example.com",
         password_hash="hash",
@@ -210,13 +322,7 @@ def test_public_studio_booking_general_and_artist_specific(client, db_session):
         account_type=AccountType.STUDIO,
         onboarding_completed=True,
     )
-    db_session.add(user)
-    db_session.flush()
-
-    studio = Studio(user_id=user.id, name="Booking Studio")
-    db_session.add(studio)
-    db_session.flush()
-
+    studio = Studio(user=user, name="Booking Studio")
     artist_user = User(
         email="artist-booking@example.com",
         password_hash="hash",
@@ -224,50 +330,138 @@ def test_public_studio_booking_general_and_artist_specific(client, db_session):
         account_type=AccountType.ARTIST,
         onboarding_completed=True,
     )
-    db_session.add(artist_user)
+    artist = Artist(user=artist_user)
+    residency = ArtistStudioResident(studio=studio, artist=artist, status="accepted")
+    db_session.add_all([user, studio, artist_user, artist, residency])
     db_session.flush()
+    return studio, artist
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("booking_type", ["general", "artist_specific"])
+async def test_public_studio_booking(aclient, booking_studio, booking_type):
+    """POST /public/studios/{slug}/booking works for general and artist_specific."""
+    _, artist = booking_studio
+    payload = {
+        "type": booking_type,
+        "client_name": "Client One",
+        "client_contact": "client@example.com",
+        "comment": "Booking question",
+    }
+    expected_artist_id = None
+    if booking_type == "artist_specific":
+        payload["artist_id"] = expected_artist_id = artist.id
 
-    artist = Artist(user_id=artist_user.id)
-    db_session.add(artist)
+    resp = await aclient.post("/api/v1/public/studios/bookingstudio/booking", json=payload)
+    assert resp.status_code == 201
+    data = resp.json()
+    assert data["type"] == booking_type
+    assert data["artist_id"] == expected_artist_id
+
+
+def test_list_booking_requests_paginated(client, db_session, login_as):
+    """GET /studios/me/booking-requests returns one page plus the total count."""
+    token = login_studio(login_as, email="studio-list@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    studio = db_session.execute(
+        select(Studio).join(User, Studio.user_id == User.id).where(User.email == "studio-list@example.com")
+    ).scalar_one()
+    for i in range(3):
+        db_session.add(
+            BookingRequest(
+                studio_id=studio.id,
+                type="general",
+                client_name=f"Client {i}",
+                client_contact=f"client{i}@example.com",
+            )
+        )
     db_session.flush()
 
-    residency = ArtistStudioResident(
+    resp = client.get("/api/v1/studios/me/booking-requests?limit=2", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 3
+    assert data["limit"] == 2
+    assert data["offset"] == 0
+
+    resp_past_end = client.get(
+        "/api/v1/studios/me/booking-requests?limit=2&offset=5",
+        headers=headers,
+    )
+    assert resp_past_end.status_code == 200
+    assert resp_past_end.json()["items"] == []
+    assert resp_past_end.json()["total"] == 3
+
+    resp_invalid = client.get(
+        "/api/v1/studios/me/booking-requests?status=bogus",
+        headers=headers,
+    )
+    assert resp_invalid.status_code == 400
+
+
+def test_update_booking_request_status(client, db_session, login_as):
+    """PATCH /studios/me/booking-requests/{id} sets the status; the list filters on it."""
+    token = login_studio(login_as, email="studio-status@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    studio = db_session.execute(
+        select(Studio).join(User, Studio.user_id == User.id).where(User.email == "studio-status@example.com")
+    ).scalar_one()
+    booking = BookingRequest(
         studio_id=studio.id,
-        artist_id=artist.id,
-        status="accepted",
+        type="general",
+        client_name="Client",
+        client_contact="client@example.com",
     )
-    db_session.add(residency)
-    db_session.commit()
-
-    # General booking
-    resp_general = client.post(
-        "/api/v1/public/studios/bookingstudio/booking",
-        json={
-            "type": "general",
-            "client_name": "Client One",
-            "client_contact": "client@example.com",
-            "comment": "General question",
-        },
+    db_session.add(booking)
+    db_session.flush()
+
+    resp = client.patch(
+        f"/api/v1/studios/me/booking-requests/{booking.id}",
+        headers=headers,
+        json={"status": "in_progress"},
     )
-    assert resp_general.status_code == 201
-    data_general = resp_general.json()
-    assert data_general["type"] == "general"
-    assert data_general["artist_id"] is None
-
-    # Artist specific booking
-    resp_specific = client.post(
-        "/api/v1/public/studios/bookingstudio/booking",
-        json={
-            "type": "artist_specific",
-            "client_name": "Client Two",
-            "client_contact": "client2@example.com",
-            "comment": "For a specific artist",
-            "artist_id": artist.id,
-        },
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "in_progress"
+
+    resp_invalid = client.patch(
+        f"/api/v1/studios/me/booking-requests/{booking.id}",
+        headers=headers,
+        json={"status": "bogus"},
+    )
+    assert resp_invalid.status_code == 422
+
+    resp_list = client.get(
+        "/api/v1/studios/me/booking-requests?status=in_progress",
+        headers=headers,
     )
-    assert resp_specific.status_code == 201
-    data_specific = resp_specific.json()
-    assert data_specific["type"] == "artist_specific"
-    assert data_specific["artist_id"] == artist.id
+    assert resp_list.status_code == 200
+    assert [item["id"] for item in resp_list.json()["items"]] == [booking.id]
+    assert resp_list.json()["items"][0]["status"] == "in_progress"
 
 
+def test_list_public_studios_omits_null_fields(client, db_session):
+    """GET /public/studios drops null card fields from the payload."""
+    user = User(
+        email="studio-list@example.com",
+        password_hash="hash",
+        username="liststudio",
+        account_type=AccountType.STUDIO,
+        onboarding_completed=True,
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(Studio(user_id=user.id, slug="liststudio", name="List Studio", city="Paris"))
+    db_session.flush()
+
+    resp = client.get("/api/v1/public/studios")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 1
+    card = data["items"][0]
+    assert card["name"] == "List Studio"
+    assert card["city"] == "Paris"
+    assert "avatar_url" not in card
+    assert "session_price_label" not in card